@@ -1,5 +1,8 @@
 __all__ = [
     "settings",
+    "FastJSONResponse",
+    "json_field",
 ]
 
 from .config import settings
+from .fast_json import FastJSONResponse, json_field
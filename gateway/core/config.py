@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -9,9 +10,192 @@ load_dotenv()
 class Settings(BaseSettings):
     PROJECT_NAME: str = os.getenv("PROJECT_NAME")
 
+    # Declarative list of proxied services, see services.json
+    SERVICE_REGISTRY_PATH: str = os.getenv(
+        "SERVICE_REGISTRY_PATH",
+        str(Path(__file__).resolve().parent.parent / "services.json"),
+    )
+
     USER_SERVICE_HOST: str = os.getenv("USER_SERVICE_HOST")
     USER_SERVICE_PORT: str = os.getenv("USER_SERVICE_PORT")
     USER_SERVICE_VERSION: str = os.getenv("USER_SERVICE_VERSION")
+    # Comma separated host:port list, defaults to USER_SERVICE_HOST:PORT
+    USER_SERVICE_ENDPOINTS: str | None = os.getenv("USER_SERVICE_ENDPOINTS")
+
+    STORAGE_APP_HOST: str | None = os.getenv("STORAGE_APP_HOST")
+    STORAGE_APP_PORT: str | None = os.getenv("STORAGE_APP_PORT")
+    STORAGE_APP_ENDPOINTS: str | None = os.getenv("STORAGE_APP_ENDPOINTS")
+
+    USER_SERVICE_STREAMING: bool = (
+        os.getenv("USER_SERVICE_STREAMING", "false").lower() == "true"
+    )
+    STORAGE_APP_STREAMING: bool = (
+        os.getenv("STORAGE_APP_STREAMING", "true").lower() == "true"
+    )
+
+    # Security
+    SECRET_KEY: str | None = os.getenv("SECRET_KEY")
+    ALGORITHM: str | None = os.getenv("ALGORITHM")
+    ACCESS_TOKEN_EXPIRE_HOURS: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_HOURS", 1))
+
+    # Auth: local access token verification
+    AUTH_LOCAL_VERIFY: bool = os.getenv("AUTH_LOCAL_VERIFY", "true").lower() == "true"
+    AUTH_REVOCATION_SYNC_INTERVAL: float = float(
+        os.getenv("AUTH_REVOCATION_SYNC_INTERVAL", 5.0)
+    )
+    AUTH_REVOCATION_SYNC_OVERLAP: float = float(
+        os.getenv("AUTH_REVOCATION_SYNC_OVERLAP", 5.0)
+    )
+    AUTH_REVOCATION_MAX_STALENESS: float = float(
+        os.getenv("AUTH_REVOCATION_MAX_STALENESS", 30.0)
+    )
+
+    # Auth: cache of user-service validation results
+    AUTH_CACHE_MAX_SIZE: int = int(os.getenv("AUTH_CACHE_MAX_SIZE", 10000))
+    AUTH_CACHE_TTL: float = float(os.getenv("AUTH_CACHE_TTL", 30.0))
+    AUTH_CACHE_NEGATIVE_TTL: float = float(os.getenv("AUTH_CACHE_NEGATIVE_TTL", 5.0))
+    # memory | shm, shm shares the cache between the workers of a host
+    AUTH_CACHE_BACKEND: str = os.getenv("AUTH_CACHE_BACKEND", "memory")
+
+    # Proxy
+    # Default budget of a request, propagated to upstreams as a deadline;
+    # services and routes override it with "deadline" in services.json
+    GATEWAY_REQUEST_TIMEOUT: float = float(os.getenv("GATEWAY_REQUEST_TIMEOUT", 15.0))
+    PROXY_MAX_BODY_SIZE: int = int(os.getenv("PROXY_MAX_BODY_SIZE", 10 * 1024 * 1024))
+
+    # Batch endpoint
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", 50))
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", 10))
+
+    # Response cache
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_REDIS_URL: str = os.getenv(
+        "RESPONSE_CACHE_REDIS_URL", "redis://redis:6379/2"
+    )
+    RESPONSE_CACHE_MAX_BYTES: int = int(
+        os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = int(
+        os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", 256 * 1024)
+    )
+    # Slot size of the shm backend, larger entries are not cached
+    RESPONSE_CACHE_SHM_SLOT_BYTES: int = int(
+        os.getenv("RESPONSE_CACHE_SHM_SLOT_BYTES", 16 * 1024)
+    )
+    # After a write, reads of the writer go to the primary database and
+    # responses tagged with it are not cached; covers replica lag plus
+    # user-service's replica health interval
+    READ_YOUR_WRITES_WINDOW: float = float(os.getenv("READ_YOUR_WRITES_WINDOW", 10.0))
+    USER_PROFILE_CACHE_TTL: float = float(os.getenv("USER_PROFILE_CACHE_TTL", 60.0))
+
+    # Shared-memory caches, one file per cache in SHARED_CACHE_DIR
+    SHARED_CACHE_DIR: str = os.getenv("SHARED_CACHE_DIR", "/dev/shm")
+    SHARED_CACHE_NAMESPACE: str = os.getenv("SHARED_CACHE_NAMESPACE", "gateway")
+    SHARED_CACHE_STRIPES: int = int(os.getenv("SHARED_CACHE_STRIPES", 64))
+
+    # Circuit breaker
+    BREAKER_WINDOW: float = float(os.getenv("BREAKER_WINDOW", 30.0))
+    BREAKER_MIN_CALLS: int = int(os.getenv("BREAKER_MIN_CALLS", 20))
+    BREAKER_ERROR_RATE: float = float(os.getenv("BREAKER_ERROR_RATE", 0.5))
+    BREAKER_SLOW_CALL_SECONDS: float = float(
+        os.getenv("BREAKER_SLOW_CALL_SECONDS", 2.0)
+    )
+    BREAKER_SLOW_CALL_RATE: float = float(os.getenv("BREAKER_SLOW_CALL_RATE", 0.8))
+    BREAKER_OPEN_SECONDS: float = float(os.getenv("BREAKER_OPEN_SECONDS", 10.0))
+    BREAKER_HALF_OPEN_CALLS: int = int(os.getenv("BREAKER_HALF_OPEN_CALLS", 3))
+
+    # Retries of idempotent upstream calls
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", 3))
+    RETRY_BACKOFF_BASE: float = float(os.getenv("RETRY_BACKOFF_BASE", 0.05))
+    RETRY_BACKOFF_MAX: float = float(os.getenv("RETRY_BACKOFF_MAX", 1.0))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", 0.1))
+    RETRY_BUDGET_MIN_PER_SECOND: float = float(
+        os.getenv("RETRY_BUDGET_MIN_PER_SECOND", 1.0)
+    )
+    RETRY_BUDGET_BURST: float = float(os.getenv("RETRY_BUDGET_BURST", 10.0))
+
+    # Hedged GET requests, the delay follows the upstream latency percentile
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", 0.95))
+    HEDGE_MIN_DELAY: float = float(os.getenv("HEDGE_MIN_DELAY", 0.01))
+    HEDGE_SAMPLES: int = int(os.getenv("HEDGE_SAMPLES", 1000))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", 50))
+
+    # Load balancing: round_robin | least_in_flight | p2c
+    LB_STRATEGY: str = os.getenv("LB_STRATEGY", "p2c")
+    LB_EJECT_FAILURES: int = int(os.getenv("LB_EJECT_FAILURES", 3))
+    LB_READMIT_SUCCESSES: int = int(os.getenv("LB_READMIT_SUCCESSES", 2))
+    HEALTH_CHECK_PATH: str = os.getenv("HEALTH_CHECK_PATH", "/")
+    HEALTH_CHECK_INTERVAL: float = float(os.getenv("HEALTH_CHECK_INTERVAL", 5.0))
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", 1.0))
+
+    # Access log
+    ACCESS_LOG_SAMPLE_RATE: float = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", 1.0))
+    ACCESS_LOG_QUEUE_SIZE: int = int(os.getenv("ACCESS_LOG_QUEUE_SIZE", 10000))
+
+    # Metrics
+    METRICS_POOL_SAMPLE_INTERVAL: float = float(
+        os.getenv("METRICS_POOL_SAMPLE_INTERVAL", 5.0)
+    )
+
+    # Response compression, levels may be overridden per route in services.json
+    COMPRESSION_ENABLED: bool = (
+        os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    )
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_LEVEL: int = int(os.getenv("COMPRESSION_BROTLI_LEVEL", 4))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))
+
+    # Adaptive concurrency limit and load shedding
+    CONCURRENCY_INITIAL_LIMIT: int = int(os.getenv("CONCURRENCY_INITIAL_LIMIT", 100))
+    CONCURRENCY_MIN_LIMIT: int = int(os.getenv("CONCURRENCY_MIN_LIMIT", 10))
+    CONCURRENCY_MAX_LIMIT: int = int(os.getenv("CONCURRENCY_MAX_LIMIT", 1000))
+    CONCURRENCY_BACKOFF: float = float(os.getenv("CONCURRENCY_BACKOFF", 0.9))
+    CONCURRENCY_TOLERANCE: float = float(os.getenv("CONCURRENCY_TOLERANCE", 2.0))
+    CONCURRENCY_LATENCY_FLOOR: float = float(
+        os.getenv("CONCURRENCY_LATENCY_FLOOR", 0.05)
+    )
+    CONCURRENCY_DRIFT: float = float(os.getenv("CONCURRENCY_DRIFT", 0.001))
+    CONCURRENCY_NORMAL_SHARE: float = float(os.getenv("CONCURRENCY_NORMAL_SHARE", 0.9))
+    CONCURRENCY_BULK_SHARE: float = float(os.getenv("CONCURRENCY_BULK_SHARE", 0.6))
+
+    # Rate limiting
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_REDIS_URL: str = os.getenv(
+        "RATE_LIMIT_REDIS_URL", "redis://redis:6379/3"
+    )
+    RATE_LIMIT_AUTH_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_AUTH_PER_MINUTE", 10))
+    RATE_LIMIT_USER_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_USER_PER_MINUTE", 600))
+    TRUST_FORWARDED_FOR: bool = (
+        os.getenv("TRUST_FORWARDED_FOR", "false").lower() == "true"
+    )
+
+    # Key for /metrics and /_gateway/*, sent as x-admin-key or as a Bearer
+    # token; those routes answer 403 while it is unset
+    GATEWAY_ADMIN_KEY: str | None = os.getenv("GATEWAY_ADMIN_KEY")
+    # The user-service admin key, sent on the revocation sync
+    ADMIN_API_KEY: str | None = os.getenv("ADMIN_API_KEY")
+
+    # Tracing, TRACE_EXPORTER: none | memory | file | module:Class
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "none")
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "traces.jsonl")
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", 1.0))
+    TRACE_SERVICE_NAME: str = os.getenv("TRACE_SERVICE_NAME", "gateway")
+
+    # Upstream HTTP clients
+    UPSTREAM_MAX_CONNECTIONS: int = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", 100))
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = int(
+        os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", 20)
+    )
+    UPSTREAM_KEEPALIVE_EXPIRY: float = float(
+        os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", 30.0)
+    )
+    UPSTREAM_CONNECT_TIMEOUT: float = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", 2.0))
+    UPSTREAM_READ_TIMEOUT: float = float(os.getenv("UPSTREAM_READ_TIMEOUT", 10.0))
+    UPSTREAM_WRITE_TIMEOUT: float = float(os.getenv("UPSTREAM_WRITE_TIMEOUT", 10.0))
+    UPSTREAM_POOL_TIMEOUT: float = float(os.getenv("UPSTREAM_POOL_TIMEOUT", 2.0))
+    UPSTREAM_HTTP2: bool = os.getenv("UPSTREAM_HTTP2", "false").lower() == "true"
 
     class Config:
         env_file = "../.env"
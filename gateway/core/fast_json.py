@@ -0,0 +1,32 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError, create_model
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core instead of the json module."""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+@lru_cache
+def field_reader(name: str) -> type[BaseModel]:
+    return create_model(f"FieldReader_{name}", **{name: (Any, None)})
+
+
+def json_field(content: bytes, name: str, default: Any = None) -> Any:
+    """Reads one top-level field of a JSON object.
+
+    The other fields are parsed but never built into Python objects.
+    """
+
+    try:
+        parsed = field_reader(name).model_validate_json(content)
+    except ValidationError:
+        return default
+
+    return getattr(parsed, name) if name in parsed.model_fields_set else default
@@ -1,5 +1,12 @@
 class AppException(Exception):
-    def __init__(self, status_code: int, service_name: str, detail: str = None):
+    def __init__(
+        self,
+        status_code: int,
+        service_name: str,
+        detail: str = None,
+        headers: dict = None,
+    ):
         self.status_code = status_code
         self.service_name = service_name
         self.detail = detail
+        self.headers = headers
@@ -4,3 +4,48 @@ from .base import AppException
 class GatewayException(AppException):
     def __init__(self, service_name: str, detail: str = None):
         super().__init__(status_code=400, service_name=service_name, detail=detail)
+
+
+class PayloadTooLargeException(AppException):
+    def __init__(self, service_name: str, detail: str = None):
+        super().__init__(status_code=413, service_name=service_name, detail=detail)
+
+
+class BadGatewayException(AppException):
+    def __init__(self, service_name: str, detail: str = None):
+        super().__init__(status_code=502, service_name=service_name, detail=detail)
+
+
+class ServiceUnavailableException(AppException):
+    def __init__(self, service_name: str, detail: str = None, retry_after: int = 1):
+        super().__init__(
+            status_code=503,
+            service_name=service_name,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class GatewayTimeoutException(AppException):
+    def __init__(self, service_name: str, detail: str = None):
+        super().__init__(status_code=504, service_name=service_name, detail=detail)
+
+
+class TooManyRequestsException(AppException):
+    def __init__(self, service_name: str, detail: str = None, retry_after: int = 1):
+        super().__init__(
+            status_code=429,
+            service_name=service_name,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class ForbiddenException(AppException):
+    def __init__(self, service_name: str, detail: str = None):
+        super().__init__(status_code=403, service_name=service_name, detail=detail)
+
+
+class NotFoundException(AppException):
+    def __init__(self, service_name: str, detail: str = None):
+        super().__init__(status_code=404, service_name=service_name, detail=detail)
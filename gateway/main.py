@@ -1,18 +1,68 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from core import FastJSONResponse, settings
 from exceptions import AppException, app_exception_handler
 from exceptions.http_exceptions import GatewayException
 from fastapi import FastAPI
-from src.middlewares import logger
-from src.routes import storage_app_router, user_service_router
+from src.middlewares import log_writer, logger
+from src.middlewares.compression import CompressionMiddleware
+from src.middlewares.concurrency import ConcurrencyLimitMiddleware
+from src.middlewares.deadline import DeadlineMiddleware
+from src.middlewares.metrics import MetricsMiddleware
+from src.routes import batch_router, internal_router, metrics_router, proxy_router
+from src.utils import (
+    balancers,
+    clients,
+    rate_limiter,
+    registry,
+    response_cache,
+    revocation_cache,
+    token_cache,
+    tracer,
+)
+from src.utils.metrics import mark_process_dead, run_pool_sampler
+from src.utils.tracing import TracingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_writer.start()
+    clients.start(registry.upstreams())
+    balancers.start(registry.upstreams())
+    pool_sampler = asyncio.create_task(run_pool_sampler())
+    if settings.AUTH_LOCAL_VERIFY:
+        revocation_cache.start()
+    try:
+        yield
+    finally:
+        pool_sampler.cancel()
+        await revocation_cache.stop()
+        await balancers.stop()
+        await response_cache.backend.close()
+        await rate_limiter.backend.close()
+        token_cache.close()
+        await clients.close()
+        log_writer.stop()
+        mark_process_dead()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
     app.add_exception_handler(AppException, app_exception_handler)
 
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(ConcurrencyLimitMiddleware)
+    app.add_middleware(MetricsMiddleware)
     app.add_middleware(logger.LoggerMiddleware)
+    app.add_middleware(DeadlineMiddleware)
+    app.add_middleware(TracingMiddleware, tracer=tracer)
 
-    app.include_router(user_service_router)
-    app.include_router(storage_app_router)
+    app.include_router(batch_router)
+    app.include_router(internal_router)
+    app.include_router(metrics_router)
+    # Catch-all /{prefix}/{path}, must come after the gateway's own routes.
+    app.include_router(proxy_router)
 
     return app
 
@@ -1,5 +1,7 @@
 __all__ = [
     "logger",
+    "log_writer",
 ]
 
 from . import logger
+from .log_writer import log_writer
@@ -0,0 +1,233 @@
+import zlib
+
+from core import settings
+from src.utils.registry import registry
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Server preference when the client accepts several encodings equally.
+PREFERENCE = ("zstd", "br", "gzip")
+
+SKIPPED_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zstd",
+    "application/octet-stream",
+    "application/pdf",
+)
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+COMPRESSORS = {"gzip": GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+
+
+def default_levels() -> dict[str, int]:
+    return {
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_LEVEL,
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+    }
+
+
+def parse_accept_encoding(value: str) -> dict[str, float]:
+    accepted = {}
+    for item in value.split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def negotiate(accept_encoding: str, levels: dict[str, int]) -> str | None:
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+
+    best, best_quality = None, 0.0
+    for encoding in PREFERENCE:
+        if encoding not in COMPRESSORS or levels.get(encoding, 0) <= 0:
+            continue
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def levels_for(path: str) -> dict[str, int]:
+    _, prefix, rest = (path.split("/", 2) + ["", ""])[:3]
+    service = registry.get(prefix)
+    if service is not None:
+        for policy in service.compression:
+            if policy.pattern.fullmatch(rest):
+                return policy.levels
+    return default_levels()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = settings.COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        levels = levels_for(scope["path"])
+        if not any(levels.get(encoding, 0) > 0 for encoding in COMPRESSORS):
+            await self.app(scope, receive, send)
+            return
+
+        # Clients that accept no encoding still get a responder, every
+        # answer of a compressing route varies with accept-encoding.
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), levels)
+        responder = CompressionResponder(
+            send, encoding, levels.get(encoding, 0), self.minimum_size
+        )
+        await self.app(scope, receive, responder)
+
+
+class CompressionResponder:
+    def __init__(self, send: Send, encoding: str | None, level: int, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Shared caches must not hand a compressed answer to a client
+            # that cannot decode it, or the other way round.
+            MutableHeaders(raw=message["headers"]).add_vary_header("accept-encoding")
+            if self.encoding is None:
+                self.passthrough = True
+                await self.send(message)
+                return
+
+            # Headers are held back until the first body chunk shows whether
+            # compressing is worth it.
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+
+            if not self.compressible(start["status"], headers, body, more_body):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.compressor = COMPRESSORS[self.encoding](self.level)
+            headers["content-encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["etag"] = "W/" + etag
+
+            if not more_body:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["content-length"] = str(len(body))
+                await self.send(start)
+                await self.send({**message, "body": body})
+                return
+
+            del headers["content-length"]
+            await self.send(start)
+
+        if more_body:
+            body = self.compressor.compress(body)
+        else:
+            body = self.compressor.compress(body) + self.compressor.finish()
+        await self.send({**message, "body": body})
+
+    def compressible(
+        self, status: int, headers: MutableHeaders, body: bytes, more_body: bool
+    ) -> bool:
+        if status < 200 or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+
+        content_type = headers.get("content-type", "").lower()
+        if content_type.startswith(SKIPPED_TYPES):
+            return False
+
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit():
+            return int(content_length) >= self.minimum_size
+        return more_body or len(body) >= self.minimum_size
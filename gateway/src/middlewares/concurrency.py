@@ -0,0 +1,77 @@
+from exceptions import app_exception_handler
+from exceptions.http_exceptions import ServiceUnavailableException
+from fastapi import Request
+from src.utils.concurrency import BULK, AdaptiveLimiter, limiter
+from src.utils.registry import registry
+from src.utils.request_context import request_stats
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def priority_for(path: str) -> str | None:
+    _, prefix, rest = (path.split("/", 2) + ["", ""])[:3]
+    if prefix == "batch":
+        return BULK
+
+    service = registry.get(prefix)
+    if service is None:
+        # The gateway's own endpoints are cheap and never shed.
+        return None
+
+    for pattern, priority in service.priorities:
+        if pattern.fullmatch(rest):
+            return priority
+    return service.priority
+
+
+class ConcurrencyLimitMiddleware:
+    def __init__(self, app: ASGIApp, limiter: AdaptiveLimiter = limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        priority = priority_for(scope["path"]) if scope["type"] == "http" else None
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not self.limiter.try_acquire(priority):
+            response = await app_exception_handler(
+                Request(scope),
+                ServiceUnavailableException(
+                    service_name="gateway", detail="Gateway overloaded"
+                ),
+            )
+            await response(scope, receive, send)
+            return
+
+        # Routes of one class on one service are expected to take alike,
+        # a bcrypt login is not compared with a cached profile read.
+        key = f"{scope['path'].split('/', 2)[1]}:{priority}"
+        stats = request_stats.get()
+        released = False
+
+        def release(failed: bool):
+            nonlocal released
+            if released:
+                return
+            released = True
+
+            # Only time spent in upstreams says anything about their load;
+            # cache hits, 304s and the gateway's own 429s and 503s did not
+            # reach one.
+            latency = None
+            if stats is not None and stats.upstream_calls:
+                latency = stats.upstream_ns / stats.upstream_calls / 1e9
+            self.limiter.release(key, latency, failed)
+
+        async def send_wrapper(message: Message):
+            # Streamed bodies can take long, the slot is held until headers.
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                release(failed=status >= 500 and status != 503)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release(failed=True)
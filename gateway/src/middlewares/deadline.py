@@ -0,0 +1,42 @@
+import time
+
+from core import settings
+from src.utils.registry import registry
+from src.utils.request_context import DEADLINE_HEADER, Deadline, request_deadline
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+def deadline_for(path: str) -> float | None:
+    _, prefix, rest = (path.split("/", 2) + ["", ""])[:3]
+
+    service = registry.get(prefix)
+    if service is None:
+        return None
+    return service.deadline_for(rest)
+
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp, timeout: float = settings.GATEWAY_REQUEST_TIMEOUT):
+        self.app = app
+        self.timeout = timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = deadline_for(scope["path"])
+        deadline = Deadline(budget=self.timeout if budget is None else budget)
+
+        # Clients may ask for a shorter budget, never a longer one.
+        requested = Headers(scope=scope).get(DEADLINE_HEADER)
+        if requested and requested.isdigit():
+            deadline.limit = time.monotonic() + int(requested) / 1000
+
+        deadline.start()
+        token = request_deadline.set(deadline)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
@@ -0,0 +1,64 @@
+import json
+import queue
+import sys
+import threading
+from typing import TextIO
+
+from core import settings
+
+
+class LogWriter:
+    def __init__(
+        self,
+        stream: TextIO = sys.stdout,
+        max_queue: int = settings.ACCESS_LOG_QUEUE_SIZE,
+    ):
+        self.stream = stream
+        self.dropped = 0
+        self._queue: queue.Queue[dict | None] = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, name="access-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def write(self, record: dict):
+        # Called on the event loop: never wait for the writer thread.
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            lines = []
+            while record is not None:
+                lines.append(json.dumps(record, separators=(",", ":")))
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if lines:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+
+            if record is None:
+                return
+
+
+log_writer = LogWriter()
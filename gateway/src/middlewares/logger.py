@@ -1,15 +1,71 @@
+import random
 import time
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from core import settings
+from src.utils.request_context import RequestStats, request_stats
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .log_writer import LogWriter, log_writer
 
-class LoggerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        print(
-            f"INFO:     {request.method} {request.url.path} completed in {process_time:.2f}s"
-        )
-        return response
+
+class LoggerMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        writer: LogWriter = log_writer,
+        sample_rate: float = settings.ACCESS_LOG_SAMPLE_RATE,
+    ):
+        self.app = app
+        self.writer = writer
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter_ns()
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status_code = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            request_stats.reset(token)
+            duration_ns = time.perf_counter_ns() - started
+
+            # Server errors are always kept, the rest is sampled.
+            if status_code >= 500 or random.random() < self.sample_rate:
+                client = scope.get("client")
+                self.writer.write(
+                    {
+                        "ts": time.time(),
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round(duration_ns / 1e6, 3),
+                        "upstream_ms": round(stats.upstream_ns / 1e6, 3),
+                        "upstream_calls": stats.upstream_calls,
+                        "request_bytes": request_bytes,
+                        "response_bytes": response_bytes,
+                        "client": client[0] if client else None,
+                    }
+                )
@@ -0,0 +1,65 @@
+import time
+
+from src.utils.metrics import request_latency, route_metrics
+from src.utils.registry import registry
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._prefixes: set[str] | None = None
+
+    def route_prefix(self, scope: Scope) -> str:
+        # Paths come from clients, only label prefixes the app really serves.
+        if self._prefixes is None:
+            self._prefixes = {
+                "/" + route.path.split("/", 2)[1]
+                for route in scope["app"].routes
+                if "{" not in route.path.split("/", 2)[1]
+            }
+            self._prefixes.update("/" + service.prefix for service in registry)
+
+        prefix = "/" + scope["path"].split("/", 2)[1]
+        return prefix if prefix in self._prefixes else "other"
+
+    def route_label(self, scope: Scope) -> str:
+        route = scope.get("route")
+        if route is None:
+            return "unmatched"
+
+        # The proxy serves every service from one route, label it per service.
+        prefix = scope.get("path_params", {}).get("prefix")
+        if prefix is not None:
+            return route.path.replace(
+                "{prefix}", prefix if prefix in registry else "other"
+            )
+        return route.path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # The matched route is only known after routing, track in-flight
+        # requests per path prefix until then.
+        in_flight = route_metrics(self.route_prefix(scope))
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            request_latency(
+                self.route_label(scope),
+                scope["method"],
+                f"{status_code // 100}xx",
+            ).observe(time.perf_counter() - started)
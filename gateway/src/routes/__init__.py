@@ -1,7 +1,11 @@
 __all__ = [
-    "user_service_router",
-    "storage_app_router",
+    "batch_router",
+    "internal_router",
+    "metrics_router",
+    "proxy_router",
 ]
 
-from .storage_app import router as storage_app_router
-from .user_service import router as user_service_router
+from .batch import router as batch_router
+from .internal import router as internal_router
+from .metrics import router as metrics_router
+from .proxy import router as proxy_router
@@ -0,0 +1,118 @@
+import asyncio
+from typing import Any, Literal
+
+from core import settings
+from exceptions import AppException
+from exceptions.http_exceptions import GatewayException, NotFoundException
+from fastapi import APIRouter, Request, Response
+from pydantic import BaseModel, Field, ValidationError
+from pydantic_core import from_json, to_json
+from src.utils import dispatch, proxy_request, rate_limiter, read_body, registry
+
+router = APIRouter(
+    tags=["gateway"],
+)
+
+# Sub-requests always run as the caller of the batch.
+RESERVED_HEADERS = {"authorization", "user_id", "content-length", "host"}
+
+
+class BatchItem(BaseModel):
+    id: str | None = None
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    headers: dict[str, str] = Field(default_factory=dict)
+    body: Any = None
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchItem] = Field(max_length=settings.BATCH_MAX_REQUESTS)
+
+
+def item_result(item: BatchItem, response: Response) -> dict:
+    content_type = response.headers.get("content-type", "")
+    body = response.body.decode(errors="replace")
+    if content_type.startswith("application/json") and body:
+        try:
+            body = from_json(response.body)
+        except ValueError:
+            pass
+
+    return {
+        "id": item.id,
+        "status": response.status_code,
+        "headers": {"content-type": content_type} if content_type else {},
+        "body": body,
+    }
+
+
+def item_error(item: BatchItem, exc: AppException) -> dict:
+    return {
+        "id": item.id,
+        "status": exc.status_code,
+        "headers": exc.headers or {},
+        "body": {"service_name": exc.service_name, "detail": exc.detail},
+    }
+
+
+async def run_item(request: Request, item: BatchItem, headers: dict) -> Response:
+    prefix, _, path = item.path.lstrip("/").partition("/")
+    path, _, query = path.partition("?")
+
+    service = registry.get(prefix)
+    if service is None or service.is_internal(path):
+        raise NotFoundException(service_name="gateway", detail="Not Found")
+
+    await rate_limiter.check(
+        request, service.name, path, service.rate_limits, method=item.method
+    )
+
+    headers = {
+        **headers,
+        **{
+            key.lower(): value
+            for key, value in item.headers.items()
+            if key.lower() not in RESERVED_HEADERS
+        },
+    }
+    body = None
+    if item.body is not None:
+        body = to_json(item.body)
+        headers["content-type"] = "application/json"
+
+    return await proxy_request(
+        service=service,
+        method=item.method,
+        path=path,
+        headers=headers,
+        body=body,
+        query=query,
+        buffered=True,
+    )
+
+
+@router.post("/batch")
+async def batch(request: Request):
+    try:
+        data = BatchRequest.model_validate_json(await read_body(request, "gateway"))
+    except ValidationError as exc:
+        raise GatewayException(service_name="gateway", detail=str(exc))
+
+    request = await dispatch(request=request)
+
+    headers = {
+        key: value
+        for key, value in request.headers.items()
+        if key in ("authorization", "user_id", "accept", "accept-language")
+    }
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def run(item: BatchItem) -> dict:
+        async with semaphore:
+            try:
+                response = await run_item(request, item, headers)
+            except AppException as exc:
+                return item_error(item, exc)
+        return item_result(item, response)
+
+    return {"responses": await asyncio.gather(*(run(item) for item in data.requests))}
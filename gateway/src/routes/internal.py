@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends
+from src.utils import (
+    balancers,
+    breakers,
+    rate_limiter,
+    require_admin_key,
+    response_cache,
+    retries,
+    singleflight,
+    token_cache,
+    tracer,
+)
+from src.utils.concurrency import limiter
+from src.utils.tracing import InMemoryExporter
+
+router = APIRouter(
+    prefix="/_gateway",
+    tags=["gateway"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+
+@router.get("/stats")
+async def get_stats():
+    return {
+        "token_cache": token_cache.stats(),
+        "singleflight": singleflight.stats(),
+        "response_cache": response_cache.stats(),
+        "circuit_breakers": breakers.stats(),
+        "upstreams": balancers.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "retries": retries.stats(),
+        "concurrency": limiter.stats(),
+    }
+
+
+@router.get("/traces")
+async def get_traces(trace_id: str | None = None):
+    # Only the in-memory exporter keeps spans around to be listed.
+    if not isinstance(tracer.exporter, InMemoryExporter):
+        return []
+
+    return [
+        span
+        for span in tracer.exporter.spans
+        if trace_id is None or span["trace_id"] == trace_id
+    ]
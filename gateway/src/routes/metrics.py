@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends, Response
+from src.utils import require_admin_key
+from src.utils.metrics import render
+
+router = APIRouter(
+    tags=["gateway"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    content, media_type = render()
+    return Response(content=content, media_type=media_type)
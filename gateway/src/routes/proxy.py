@@ -0,0 +1,46 @@
+from exceptions.http_exceptions import NotFoundException
+from fastapi import APIRouter, Request
+from src.utils import (
+    dispatch,
+    proxy_request,
+    rate_limiter,
+    read_body,
+    registry,
+    stream_body,
+)
+
+router = APIRouter(
+    tags=["proxy"],
+)
+
+
+@router.api_route(
+    "/{prefix}/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"]
+)
+async def gateway_proxy(request: Request, prefix: str, path: str):
+    service = registry.get(prefix)
+    if service is None or service.is_internal(path):
+        raise NotFoundException(service_name="gateway", detail="Not Found")
+
+    request = await dispatch(request=request)
+    await rate_limiter.check(request, service.name, path, service.rate_limits)
+
+    method = request.method
+    headers = dict(request.headers)
+    headers.pop("content-length", None)
+
+    body = None
+    if method in ["POST", "PUT", "PATCH"]:
+        if service.streaming:
+            body = stream_body(request, service.name)
+        else:
+            body = await read_body(request, service.name)
+
+    return await proxy_request(
+        service=service,
+        method=method,
+        path=path,
+        headers=headers,
+        body=body,
+        query=request.url.query,
+    )
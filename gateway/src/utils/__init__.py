@@ -1,7 +1,45 @@
 __all__ = [
+    "balancers",
+    "breakers",
+    "CachePolicy",
+    "find_policy",
+    "response_cache",
+    "clients",
     "forward_request",
+    "forward_stream_request",
+    "RateLimitPolicy",
+    "rate_limiter",
+    "proxy_request",
+    "read_body",
+    "registry",
+    "retries",
+    "Service",
+    "stream_body",
     "dispatch",
+    "require_admin_key",
+    "revocation_cache",
+    "singleflight",
+    "token_cache",
+    "tracer",
 ]
 
+from .admin import require_admin_key
 from .authorize import dispatch
-from .request_worker import forward_request
+from .balancer import balancers
+from .circuit_breaker import breakers
+from .clients import clients
+from .proxy import proxy_request
+from .rate_limit import RateLimitPolicy, rate_limiter
+from .registry import Service, registry
+from .request_worker import (
+    forward_request,
+    forward_stream_request,
+    read_body,
+    stream_body,
+)
+from .response_cache import CachePolicy, find_policy, response_cache
+from .retry import retries
+from .revocation import revocation_cache
+from .singleflight import singleflight
+from .token_cache import token_cache
+from .tracing import tracer
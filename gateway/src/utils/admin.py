@@ -0,0 +1,27 @@
+import hmac
+
+from core import settings
+from exceptions.http_exceptions import ForbiddenException
+from fastapi import Request
+
+ADMIN_KEY_HEADER = "x-admin-key"
+
+
+def require_admin_key(request: Request):
+    """Guards the gateway's own operational routes.
+
+    Prometheus sends the key with its `authorization` scrape option, so a
+    Bearer token is accepted too.
+    """
+
+    key = request.headers.get(ADMIN_KEY_HEADER)
+    if key is None:
+        auth = request.headers.get("authorization", "")
+        if auth.startswith("Bearer "):
+            key = auth.removeprefix("Bearer ")
+
+    if not settings.GATEWAY_ADMIN_KEY or key is None:
+        raise ForbiddenException(service_name="gateway", detail="Admin key required")
+
+    if not hmac.compare_digest(key.encode(), settings.GATEWAY_ADMIN_KEY.encode()):
+        raise ForbiddenException(service_name="gateway", detail="Invalid admin key")
@@ -1,51 +1,115 @@
+import time
+
 import httpx
-from core import settings
+from core import json_field, settings
 from exceptions.http_exceptions import GatewayException
 from fastapi import HTTPException, Request
-from httpx import AsyncClient
 
-NO_TOKEN_PATHS = [
-    "/users/auth/register",
-    "/users/auth/login",
-    "/users/auth/verify_otp",
-    "/users/auth/send_otp",
-    "/users/auth/reset_password/otp",
-    "/docs",
-    "/openapi.json",
-]
+from .clients import clients
+from .jwt_tokens import decode_token
+from .metrics import auth_latency
+from .registry import registry
+from .request_worker import call_upstream, error_detail
+from .revocation import revocation_cache
+from .singleflight import singleflight
+from .token_cache import token_cache
 
 
-async def dispatch(request: Request):
-    if request.url.path in NO_TOKEN_PATHS:
-        return request
+def verify_token(request: Request) -> str:
+    auth = request.headers.get("Authorization")
+
+    if not auth or not auth.startswith("Bearer "):
+        raise GatewayException(
+            service_name="gateway", detail="Missing or invalid token"
+        )
+
+    payload = decode_token(auth.split("Bearer ")[-1])
+
+    refresh_token_id = payload.get("refresh_token_id")
+    if not refresh_token_id or revocation_cache.is_revoked(refresh_token_id):
+        raise GatewayException(service_name="gateway", detail="No valid token found")
+
+    user_id = payload.get("user_id")
+    if not user_id:
+        raise GatewayException(service_name="gateway", detail="Token invalid")
 
-    base_url = f"http://{settings.USER_SERVICE_HOST}:{settings.USER_SERVICE_PORT}/{settings.USER_SERVICE_VERSION}/"
+    return user_id
+
+
+async def fetch_user_id(token: str, headers: dict) -> str:
     method = "GET"
     endpoint = "validate"
-    headers = dict(request.headers)
-    headers.pop("content-length", None)
 
-    async with AsyncClient(base_url=base_url) as client:
-        try:
-            response = await client.request(
-                method=method.upper(),
-                url=endpoint,
-                headers=headers,
-            )
-        except httpx.RequestError as e:
-            raise GatewayException(
-                service_name="user_service", detail="Authorization request error"
-            )
+    client = clients.get("user_service")
+
+    response = await call_upstream(
+        "user_service",
+        lambda base_url: client.request(
+            method=method.upper(),
+            url=f"{base_url}/{endpoint}",
+            headers=headers,
+        ),
+        error_message="Authorization request error",
+        method=method,
+    )
 
     if response.status_code >= 400:
-        try:
-            detail = response.json().get("detail", response.text)
-        except Exception:
-            detail = response.text
+        detail = error_detail(response)
+        if response.status_code < 500:
+            token_cache.set_invalid(token, detail)
         raise GatewayException(service_name="user_service", detail=detail)
 
-    user_id = response.json().get("user_id")
+    user_id = json_field(response.content, "user_id")
+    token_cache.set_valid(token, user_id)
+
+    return user_id
+
+
+async def validate_token(request: Request) -> str:
+    token = request.headers.get("Authorization", "")
+
+    cached = token_cache.get(token)
+    if cached is not None:
+        if cached.user_id is None:
+            raise GatewayException(service_name="user_service", detail=cached.detail)
+        return cached.user_id
+
+    headers = dict(request.headers)
+    headers.pop("content-length", None)
+
+    return await singleflight.do(
+        ("validate", token),
+        lambda: fetch_user_id(token=token, headers=headers),
+    )
+
+
+def strip_user_id(request: Request):
+    # user_id is only ever set by the gateway; a client-sent one is dropped
+    # on every path, public ones included.
+    raw_headers = request.headers.__dict__["_list"]
+    raw_headers[:] = [(key, value) for key, value in raw_headers if key != b"user_id"]
+    return raw_headers
+
+
+async def dispatch(request: Request):
+    raw_headers = strip_user_id(request)
+    request.state.user_id = None
+
+    if registry.is_public(request.url.path):
+        return request
+
+    # Without a recent revocation snapshot a locally valid signature is not
+    # enough, so fall back to asking user-service.
+    started = time.perf_counter()
+    if settings.AUTH_LOCAL_VERIFY and revocation_cache.is_fresh():
+        mode = "local"
+        user_id = verify_token(request)
+    else:
+        mode = "remote"
+        user_id = await validate_token(request)
+    auth_latency(mode).observe(time.perf_counter() - started)
 
-    request.headers.__dict__["_list"].append((b"user_id", str(user_id).encode()))
+    request.state.user_id = str(user_id)
+    raw_headers.append((b"user_id", request.state.user_id.encode()))
 
     return request
@@ -0,0 +1,157 @@
+import asyncio
+import itertools
+import random
+from dataclasses import dataclass
+
+import httpx
+from core import settings
+from exceptions.http_exceptions import ServiceUnavailableException
+
+from .clients import Upstream, clients
+
+
+@dataclass
+class Endpoint:
+    origin: str
+    base_url: str
+    healthy: bool = True
+    in_flight: int = 0
+    failures: int = 0
+    successes: int = 0
+
+    def record(self, failed: bool):
+        if failed:
+            self.failures += 1
+            self.successes = 0
+            if self.healthy and self.failures >= settings.LB_EJECT_FAILURES:
+                print(f"WARNING:  Ejecting upstream {self.origin}")
+                self.healthy = False
+            return
+
+        self.successes += 1
+        self.failures = 0
+        if not self.healthy and self.successes >= settings.LB_READMIT_SUCCESSES:
+            print(f"INFO:     Re-admitting upstream {self.origin}")
+            self.healthy = True
+
+
+class Balancer:
+    def __init__(self, upstream: Upstream, strategy: str = settings.LB_STRATEGY):
+        self.name = upstream.name
+        self.endpoints = [
+            Endpoint(origin=origin, base_url=origin + upstream.base_path)
+            for origin in upstream.origins
+        ]
+        self._pick = {
+            "round_robin": self._round_robin,
+            "least_in_flight": self._least_in_flight,
+            "p2c": self._power_of_two,
+        }[strategy]
+        self._counter = itertools.count()
+
+    def pick(self, exclude: Endpoint | None = None) -> Endpoint:
+        candidates = [
+            endpoint
+            for endpoint in self.endpoints
+            if endpoint.healthy and endpoint is not exclude
+        ]
+        if not candidates:
+            # Every replica looks sick: keep trying all of them rather than
+            # refusing traffic because of possibly stale health data.
+            candidates = [e for e in self.endpoints if e is not exclude]
+        if not candidates:
+            # A single replica is still better than no answer.
+            candidates = self.endpoints
+        if not candidates:
+            raise ServiceUnavailableException(
+                service_name=self.name, detail="No upstream available"
+            )
+
+        return self._pick(candidates)
+
+    def _round_robin(self, candidates: list[Endpoint]) -> Endpoint:
+        return candidates[next(self._counter) % len(candidates)]
+
+    def _least_in_flight(self, candidates: list[Endpoint]) -> Endpoint:
+        offset = next(self._counter) % len(candidates)
+        rotated = candidates[offset:] + candidates[:offset]
+        return min(rotated, key=lambda endpoint: endpoint.in_flight)
+
+    def _power_of_two(self, candidates: list[Endpoint]) -> Endpoint:
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = random.sample(candidates, 2)
+        return first if first.in_flight <= second.in_flight else second
+
+    async def probe(self, client: httpx.AsyncClient):
+        async def check(endpoint: Endpoint):
+            try:
+                response = await client.get(
+                    endpoint.origin + settings.HEALTH_CHECK_PATH,
+                    timeout=settings.HEALTH_CHECK_TIMEOUT,
+                )
+                endpoint.record(failed=response.status_code >= 500)
+            except httpx.HTTPError:
+                endpoint.record(failed=True)
+
+        await asyncio.gather(*(check(endpoint) for endpoint in self.endpoints))
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "origin": endpoint.origin,
+                "healthy": endpoint.healthy,
+                "in_flight": endpoint.in_flight,
+                "failures": endpoint.failures,
+            }
+            for endpoint in self.endpoints
+        ]
+
+
+class BalancerRegistry:
+    def __init__(self):
+        self._balancers: dict[str, Balancer] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self, upstreams: dict[str, Upstream]):
+        self._balancers = {
+            name: Balancer(upstream) for name, upstream in upstreams.items()
+        }
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL)
+            await asyncio.gather(
+                *(
+                    balancer.probe(clients.get(name))
+                    for name, balancer in self._balancers.items()
+                )
+            )
+
+    def get(self, service_name: str) -> Balancer:
+        balancer = self._balancers.get(service_name)
+
+        if balancer is None:
+            raise ServiceUnavailableException(
+                service_name=service_name, detail="Upstream is not configured"
+            )
+
+        return balancer
+
+    def stats(self) -> dict:
+        return {name: balancer.stats() for name, balancer in self._balancers.items()}
+
+
+balancers = BalancerRegistry()
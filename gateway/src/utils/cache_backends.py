@@ -0,0 +1,122 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from core import settings
+
+from .shared_memory import SharedHashTable
+
+SHM_LOCK_RETRY_DELAY = 0.001
+
+
+def redis_client(url: str):
+    try:
+        from redis import asyncio as redis
+    except ImportError:
+        raise RuntimeError("Redis backends require the 'redis' package")
+
+    return redis.from_url(url)
+
+
+class MemoryBackend:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        if len(value) > self.max_bytes:
+            return
+
+        self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._size += len(value)
+
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._drop(key)
+
+    async def close(self):
+        self._entries.clear()
+        self._size = 0
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+class RedisBackend:
+    def __init__(self, url: str, prefix: str = "gateway:"):
+        self.prefix = prefix
+        self._redis = redis_client(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._redis.set(self.prefix + key, value, px=max(int(ttl * 1000), 1))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._redis.delete(*(self.prefix + key for key in keys))
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+class SharedMemoryBackend:
+    """Shared by all workers on the host, entries must fit in a slot."""
+
+    def __init__(self, max_bytes: int, slot_bytes: int):
+        self._table = SharedHashTable(
+            name="responses",
+            slots=max(max_bytes // slot_bytes, 1),
+            value_size=slot_bytes,
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        return self._table.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._table.set(key, value, ttl)
+
+    async def delete(self, *keys: str):
+        # Stripe locks are held for a few writes, retry instead of blocking
+        # the event loop; an invalidation must not be dropped.
+        while keys := self._table.delete(*keys):
+            await asyncio.sleep(SHM_LOCK_RETRY_DELAY)
+
+    async def close(self):
+        self._table.close()
+
+
+def build_backend(kind: str = settings.RESPONSE_CACHE_BACKEND):
+    if kind == "memory":
+        return MemoryBackend(max_bytes=settings.RESPONSE_CACHE_MAX_BYTES)
+    if kind == "redis":
+        return RedisBackend(url=settings.RESPONSE_CACHE_REDIS_URL)
+    if kind == "shm":
+        return SharedMemoryBackend(
+            max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+            slot_bytes=settings.RESPONSE_CACHE_SHM_SLOT_BYTES,
+        )
+
+    raise ValueError(f"Unknown cache backend: {kind}")
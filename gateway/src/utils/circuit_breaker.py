@@ -0,0 +1,125 @@
+import math
+import time
+from collections import deque
+
+from core import settings
+from exceptions.http_exceptions import ServiceUnavailableException
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.opened_at: float | None = None
+        self._calls: deque[tuple[float, bool, bool]] = deque()
+        self._failures = 0
+        self._slow = 0
+        self._probes = 0
+        self._probe_successes = 0
+
+    def before_call(self):
+        if self.state == OPEN:
+            remaining = (
+                self.opened_at + settings.BREAKER_OPEN_SECONDS - time.monotonic()
+            )
+            if remaining > 0:
+                raise ServiceUnavailableException(
+                    service_name=self.name,
+                    detail="Circuit open",
+                    retry_after=math.ceil(remaining),
+                )
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes >= settings.BREAKER_HALF_OPEN_CALLS:
+                raise ServiceUnavailableException(
+                    service_name=self.name, detail="Circuit half-open"
+                )
+            self._probes += 1
+
+    def release(self):
+        if self.state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record(self, failed: bool, latency: float):
+        slow = latency >= settings.BREAKER_SLOW_CALL_SECONDS
+
+        if self.state == HALF_OPEN:
+            self.release()
+            if failed or slow:
+                self._transition(OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= settings.BREAKER_HALF_OPEN_CALLS:
+                self._transition(CLOSED)
+            return
+
+        if self.state == OPEN:
+            return
+
+        now = time.monotonic()
+        self._calls.append((now, failed, slow))
+        self._failures += failed
+        self._slow += slow
+        self._trim(now)
+
+        calls = len(self._calls)
+        if calls < settings.BREAKER_MIN_CALLS:
+            return
+
+        if (
+            self._failures / calls >= settings.BREAKER_ERROR_RATE
+            or self._slow / calls >= settings.BREAKER_SLOW_CALL_RATE
+        ):
+            self._transition(OPEN)
+
+    def _trim(self, now: float):
+        horizon = now - settings.BREAKER_WINDOW
+        while self._calls and self._calls[0][0] < horizon:
+            _, failed, slow = self._calls.popleft()
+            self._failures -= failed
+            self._slow -= slow
+
+    def _transition(self, state: str):
+        print(f"WARNING:  Circuit '{self.name}' {self.state} -> {state}")
+        self.state = state
+        self._probes = 0
+        self._probe_successes = 0
+
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        if state == CLOSED:
+            self._calls.clear()
+            self._failures = 0
+            self._slow = 0
+
+    def stats(self) -> dict:
+        self._trim(time.monotonic())
+        calls = len(self._calls)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "error_rate": self._failures / calls if calls else 0.0,
+            "slow_rate": self._slow / calls if calls else 0.0,
+        }
+
+
+class BreakerRegistry:
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, service_name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(service_name)
+        if breaker is None:
+            breaker = self._breakers[service_name] = CircuitBreaker(service_name)
+        return breaker
+
+    def stats(self) -> dict:
+        return {name: breaker.stats() for name, breaker in self._breakers.items()}
+
+
+breakers = BreakerRegistry()
@@ -0,0 +1,108 @@
+from dataclasses import dataclass, field
+
+import httpx
+from core import settings
+from exceptions.http_exceptions import GatewayException
+from httpx import AsyncClient
+
+from .request_context import DEADLINE_HEADER, remaining_budget
+from .tracing import tracer
+
+
+@dataclass
+class Upstream:
+    name: str
+    origins: list[str]
+    base_path: str = ""
+    # Overrides of the UPSTREAM_*_TIMEOUT settings: connect, read, write, pool
+    timeouts: dict[str, float] = field(default_factory=dict)
+
+
+def parse_origins(endpoints: str | None, host: str | None, port: str | None):
+    if not endpoints:
+        if not host or not port:
+            return []
+        endpoints = f"{host}:{port}"
+
+    origins = []
+    for endpoint in endpoints.split(","):
+        endpoint = endpoint.strip().rstrip("/")
+        if not endpoint:
+            continue
+        if "://" not in endpoint:
+            endpoint = f"http://{endpoint}"
+        origins.append(endpoint)
+    return origins
+
+
+def http2_enabled() -> bool:
+    if not settings.UPSTREAM_HTTP2:
+        return False
+
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print(
+            "WARNING:  UPSTREAM_HTTP2 is set but 'h2' is not installed, using HTTP/1.1"
+        )
+        return False
+
+    return True
+
+
+async def add_deadline(request: httpx.Request):
+    remaining = remaining_budget()
+    if remaining is not None:
+        request.headers[DEADLINE_HEADER] = str(max(int(remaining * 1000), 1))
+
+
+async def add_trace_context(request: httpx.Request):
+    tracer.inject(request.headers)
+
+
+class ClientRegistry:
+    def __init__(self):
+        self._clients: dict[str, AsyncClient] = {}
+
+    def start(self, upstreams: dict[str, Upstream]):
+        limits = httpx.Limits(
+            max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.UPSTREAM_KEEPALIVE_EXPIRY,
+        )
+        timeouts = {
+            "connect": settings.UPSTREAM_CONNECT_TIMEOUT,
+            "read": settings.UPSTREAM_READ_TIMEOUT,
+            "write": settings.UPSTREAM_WRITE_TIMEOUT,
+            "pool": settings.UPSTREAM_POOL_TIMEOUT,
+        }
+        http2 = http2_enabled()
+
+        for service_name, upstream in upstreams.items():
+            self._clients[service_name] = AsyncClient(
+                limits=limits,
+                timeout=httpx.Timeout(**{**timeouts, **upstream.timeouts}),
+                http2=http2,
+                event_hooks={"request": [add_deadline, add_trace_context]},
+            )
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def items(self):
+        return self._clients.items()
+
+    def get(self, service_name: str) -> AsyncClient:
+        client = self._clients.get(service_name)
+
+        if client is None:
+            raise GatewayException(
+                service_name=service_name, detail="Upstream is not configured"
+            )
+
+        return client
+
+
+clients = ClientRegistry()
@@ -0,0 +1,94 @@
+import time
+
+from core import settings
+
+from .metrics import CONCURRENCY_LIMIT, shed_requests
+
+CRITICAL = "critical"
+NORMAL = "normal"
+BULK = "bulk"
+
+# Share of the current limit each class may fill, lower classes are shed
+# first while critical traffic can still use the whole limit.
+PRIORITY_SHARES = {
+    CRITICAL: 1.0,
+    NORMAL: settings.CONCURRENCY_NORMAL_SHARE,
+    BULK: settings.CONCURRENCY_BULK_SHARE,
+}
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit driven by upstream latency.
+
+    The limit grows by one per window of successful calls and shrinks
+    multiplicatively, at most once per round trip, when latency rises well
+    above the baseline of the same kind of request or upstreams fail. Each
+    service and priority keeps its own baseline so fast routes do not make
+    slow ones look overloaded.
+    """
+
+    def __init__(self):
+        self.limit = float(settings.CONCURRENCY_INITIAL_LIMIT)
+        self.in_flight = 0
+        self.baselines: dict[str, float] = {}
+        self._decreased_at = 0.0
+        self.shed = {priority: 0 for priority in PRIORITY_SHARES}
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    def try_acquire(self, priority: str) -> bool:
+        if self.in_flight >= max(1, int(self.limit * PRIORITY_SHARES[priority])):
+            self.shed[priority] += 1
+            shed_requests(priority).inc()
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def release(self, key: str, latency: float | None, failed: bool):
+        """Free a slot; latency is the upstream time of the request, None
+        when the gateway answered on its own and there is nothing to learn.
+        """
+
+        self.in_flight -= 1
+        if latency is None:
+            return
+
+        baseline = self.baselines.get(key)
+        if baseline is None or latency < baseline:
+            baseline = latency
+        else:
+            # Drift upwards slowly so the baseline follows a slower upstream.
+            baseline += (latency - baseline) * settings.CONCURRENCY_DRIFT
+        self.baselines[key] = baseline
+
+        threshold = max(
+            baseline * settings.CONCURRENCY_TOLERANCE,
+            settings.CONCURRENCY_LATENCY_FLOOR,
+        )
+        now = time.monotonic()
+
+        if failed or latency > threshold:
+            if now - self._decreased_at >= latency:
+                self.limit = max(
+                    settings.CONCURRENCY_MIN_LIMIT,
+                    self.limit * settings.CONCURRENCY_BACKOFF,
+                )
+                self._decreased_at = now
+                CONCURRENCY_LIMIT.set(self.limit)
+        elif self.in_flight + 1 >= self.limit / 2:
+            # Only grow while the limit is actually being used.
+            self.limit = min(
+                settings.CONCURRENCY_MAX_LIMIT, self.limit + 1 / self.limit
+            )
+            CONCURRENCY_LIMIT.set(self.limit)
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "baselines": self.baselines,
+            "shed": self.shed,
+        }
+
+
+limiter = AdaptiveLimiter()
@@ -0,0 +1,24 @@
+from typing import Any, Dict
+
+import jwt
+from core import settings
+from exceptions.http_exceptions import GatewayException
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    try:
+        payload = jwt.decode(
+            token,
+            key=settings.SECRET_KEY,
+            algorithms=[
+                settings.ALGORITHM,
+            ],
+            options={
+                "require": ["exp"],
+            },
+        )
+        return payload
+    except jwt.ExpiredSignatureError:
+        raise GatewayException(service_name="gateway", detail="Token expired")
+    except jwt.InvalidTokenError:
+        raise GatewayException(service_name="gateway", detail="Token invalid")
@@ -0,0 +1,171 @@
+import asyncio
+import os
+from functools import lru_cache
+
+from core import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from .clients import clients
+
+# Set PROMETHEUS_MULTIPROC_DIR before start-up when running several uvicorn
+# workers, every worker then writes its samples to a shared mmap directory.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+REQUEST_LATENCY = Histogram(
+    "gateway_request_duration_seconds",
+    "Time spent handling a request in the gateway.",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "gateway_requests_in_flight",
+    "Requests currently being handled.",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_LATENCY = Histogram(
+    "gateway_upstream_duration_seconds",
+    "Time until upstream response headers arrive.",
+    ["service_name"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "gateway_upstream_in_flight",
+    "Upstream calls currently waiting for response headers.",
+    ["service_name"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_ERRORS = Counter(
+    "gateway_upstream_errors_total",
+    "Failed upstream calls by kind (transport, server_error, circuit_open).",
+    ["service_name", "kind"],
+)
+UPSTREAM_RETRIES = Counter(
+    "gateway_upstream_retries_total",
+    "Extra upstream attempts by kind (retry, hedge).",
+    ["service_name", "kind"],
+)
+AUTH_LATENCY = Histogram(
+    "gateway_auth_duration_seconds",
+    "Time spent authorizing a request in dispatch().",
+    ["mode"],
+    buckets=LATENCY_BUCKETS,
+)
+CONCURRENCY_LIMIT = Gauge(
+    "gateway_concurrency_limit",
+    "Current adaptive concurrency limit.",
+    multiprocess_mode="liveall",
+)
+SHED_REQUESTS = Counter(
+    "gateway_shed_requests_total",
+    "Requests rejected by the concurrency limiter.",
+    ["priority"],
+)
+POOL_CONNECTIONS = Gauge(
+    "gateway_upstream_pool_connections",
+    "Connections held by the upstream client pool.",
+    ["service_name", "state"],
+    multiprocess_mode="livesum",
+)
+POOL_LIMIT = Gauge(
+    "gateway_upstream_pool_max_connections",
+    "Configured connection limit of the upstream client pool.",
+    ["service_name"],
+    multiprocess_mode="liveall",
+)
+
+
+@lru_cache(maxsize=None)
+def route_metrics(route: str):
+    return REQUESTS_IN_FLIGHT.labels(route)
+
+
+@lru_cache(maxsize=None)
+def request_latency(route: str, method: str, status: str):
+    return REQUEST_LATENCY.labels(route, method, status)
+
+
+@lru_cache(maxsize=None)
+def upstream_metrics(service_name: str):
+    return (
+        UPSTREAM_LATENCY.labels(service_name),
+        UPSTREAM_IN_FLIGHT.labels(service_name),
+    )
+
+
+@lru_cache(maxsize=None)
+def upstream_errors(service_name: str, kind: str):
+    return UPSTREAM_ERRORS.labels(service_name, kind)
+
+
+@lru_cache(maxsize=None)
+def upstream_retries(service_name: str, kind: str):
+    return UPSTREAM_RETRIES.labels(service_name, kind)
+
+
+@lru_cache(maxsize=None)
+def auth_latency(mode: str):
+    return AUTH_LATENCY.labels(mode)
+
+
+@lru_cache(maxsize=None)
+def shed_requests(priority: str):
+    return SHED_REQUESTS.labels(priority)
+
+
+def sample_pools():
+    for service_name, client in clients.items():
+        # httpx does not expose pool usage publicly, read it from httpcore.
+        pool = getattr(client._transport, "_pool", None)
+        connections = getattr(pool, "connections", [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+
+        POOL_CONNECTIONS.labels(service_name, "active").set(len(connections) - idle)
+        POOL_CONNECTIONS.labels(service_name, "idle").set(idle)
+        POOL_LIMIT.labels(service_name).set(settings.UPSTREAM_MAX_CONNECTIONS)
+
+
+async def run_pool_sampler():
+    while True:
+        sample_pools()
+        await asyncio.sleep(settings.METRICS_POOL_SAMPLE_INTERVAL)
+
+
+def render() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,75 @@
+from typing import AsyncIterator
+
+from fastapi import Response
+
+from .registry import Service
+from .request_worker import forward_request, forward_stream_request
+from .response_cache import READ_CONSISTENCY_HEADER, find_policy, response_cache
+from .tracing import tracer
+
+
+async def proxy_request(
+    service: Service,
+    method: str,
+    path: str,
+    headers: dict,
+    body: bytes | AsyncIterator[bytes] | None = None,
+    query: str = "",
+    buffered: bool = False,
+) -> Response:
+    method = method.upper()
+    endpoint = f"{path}?{query}" if query else path
+
+    with tracer.span("proxy", service=service.name, method=method, path=path):
+        return await _proxy(service, method, path, endpoint, headers, body, buffered)
+
+
+async def _proxy(
+    service: Service,
+    method: str,
+    path: str,
+    endpoint: str,
+    headers: dict,
+    body: bytes | AsyncIterator[bytes] | None,
+    buffered: bool,
+) -> Response:
+
+    user_id = headers.get("user_id")
+
+    policy = find_policy(service.cache_policies, path) if method == "GET" else None
+    if policy is not None:
+        # Only cached reads pay for the lookup, a stale replica answer would
+        # otherwise be stored for the whole TTL.
+        if await response_cache.recently_written(user_id):
+            headers = {**headers, READ_CONSISTENCY_HEADER: "primary"}
+        return await response_cache.forward(
+            endpoint=endpoint,
+            service_name=service.name,
+            policy=policy,
+            headers=headers,
+        )
+
+    if service.streaming and not buffered:
+        return await forward_stream_request(
+            method=method,
+            endpoint=endpoint,
+            headers=headers,
+            body=body,
+            service_name=service.name,
+        )
+
+    response = await forward_request(
+        method=method,
+        endpoint=endpoint,
+        headers=headers,
+        body=body,
+        service_name=service.name,
+    )
+
+    if method != "GET":
+        if (method, path) in service.invalidations:
+            await response_cache.invalidate_tag(user_id)
+        else:
+            await response_cache.mark_written(user_id)
+
+    return response
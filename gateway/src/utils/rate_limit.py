@@ -0,0 +1,207 @@
+import math
+import re
+import time
+from dataclasses import dataclass, field
+
+from core import settings
+from exceptions.http_exceptions import TooManyRequestsException
+from fastapi import Request
+
+from .cache_backends import redis_client
+
+
+@dataclass
+class RateLimitPolicy:
+    name: str
+    pattern: re.Pattern
+    limit: int
+    window: float
+    # "ip" or "user"; user-keyed policies fall back to the IP when the
+    # request is not authenticated.
+    key: str = "ip"
+    methods: set[str] | None = None
+
+
+@dataclass
+class WindowCounter:
+    index: int
+    current: int = 0
+    previous: int = 0
+
+
+@dataclass
+class WindowCounters:
+    """Counters of every key limited over one window length."""
+
+    counters: dict[str, WindowCounter] = field(default_factory=dict)
+    purged_at: float = 0.0
+
+
+def sliding_window(
+    current: int, previous: int, limit: int, window: float, now: float
+) -> tuple[bool, int]:
+    elapsed = (now % window) / window
+    estimate = previous * (1 - elapsed) + current
+    if estimate <= limit:
+        return True, 0
+
+    # Time until the weighted share of the previous window has drained
+    # enough, or until the current window ends when it is full on its own.
+    if current >= limit or previous == 0:
+        wait = window * (1 - elapsed)
+    else:
+        wait = window * (1 - elapsed - (limit - current) / previous)
+    # Rounded first so float noise does not add a whole second.
+    return False, max(1, math.ceil(round(wait, 6)))
+
+
+# Counts the request only when the sliding-window estimate allows it, so
+# rejected retries do not keep a client over the limit. Returns the allowed
+# flag and both counters as they were before this request.
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call("GET", KEYS[1]) or "0")
+local previous = tonumber(redis.call("GET", KEYS[2]) or "0")
+local estimate = previous * (1 - tonumber(ARGV[2])) + (current + 1)
+if estimate > tonumber(ARGV[1]) then
+    return {0, current, previous}
+end
+redis.call("INCR", KEYS[1])
+redis.call("PEXPIRE", KEYS[1], ARGV[3])
+return {1, current, previous}
+"""
+
+
+class MemoryRateLimitBackend:
+    def __init__(self):
+        # Keyed by window length, each purged on its own schedule so short
+        # windows do not wipe the counters of longer ones.
+        self._windows: dict[float, WindowCounters] = {}
+
+    async def hit(self, key: str, limit: int, window: float) -> tuple[bool, int]:
+        now = time.time()
+        index = int(now // window)
+        counters = self._windows.setdefault(window, WindowCounters())
+        self._purge(counters, now, window)
+
+        counter = counters.counters.get(key)
+        if counter is None or counter.index < index - 1:
+            counter = counters.counters[key] = WindowCounter(index=index)
+        elif counter.index == index - 1:
+            counter.index, counter.previous, counter.current = (
+                index,
+                counter.current,
+                0,
+            )
+
+        allowed, retry_after = sliding_window(
+            counter.current + 1, counter.previous, limit, window, now
+        )
+        if allowed:
+            counter.current += 1
+        return allowed, retry_after
+
+    async def close(self):
+        self._windows.clear()
+
+    def _purge(self, counters: WindowCounters, now: float, window: float):
+        if now - counters.purged_at < window:
+            return
+
+        counters.purged_at = now
+        index = int(now // window)
+        counters.counters = {
+            key: counter
+            for key, counter in counters.counters.items()
+            if counter.index >= index - 1
+        }
+
+
+class RedisRateLimitBackend:
+    def __init__(self, client=None, url: str = settings.RATE_LIMIT_REDIS_URL):
+        self._redis = client if client is not None else redis_client(url)
+        self._script = self._redis.register_script(SLIDING_WINDOW_SCRIPT)
+
+    async def hit(self, key: str, limit: int, window: float) -> tuple[bool, int]:
+        now = time.time()
+        index = int(now // window)
+
+        # The hash tag keeps both windows of a key in one cluster slot.
+        allowed, current, previous = await self._script(
+            keys=[f"{{{key}}}:{index}", f"{{{key}}}:{index - 1}"],
+            args=[limit, repr((now % window) / window), int(window * 2000)],
+        )
+        if allowed:
+            return True, 0
+
+        _, retry_after = sliding_window(current + 1, previous, limit, window, now)
+        return False, max(1, retry_after)
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def build_rate_limit_backend(kind: str = settings.RATE_LIMIT_BACKEND):
+    if kind == "memory":
+        return MemoryRateLimitBackend()
+    if kind == "redis":
+        return RedisRateLimitBackend()
+
+    raise ValueError(f"Unknown rate limit backend: {kind}")
+
+
+def client_ip(request: Request) -> str:
+    if settings.TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    def __init__(self, backend=None):
+        self.backend = backend or build_rate_limit_backend()
+        self.rejected = 0
+
+    async def check(
+        self,
+        request: Request,
+        service_name: str,
+        path: str,
+        policies: list[RateLimitPolicy],
+        method: str | None = None,
+    ):
+        method = method or request.method
+        for policy in policies:
+            if policy.methods and method not in policy.methods:
+                continue
+            if not policy.pattern.fullmatch(path):
+                continue
+
+            identity = None
+            if policy.key == "user":
+                # Only the id dispatch() authenticated, never a client header.
+                identity = getattr(request.state, "user_id", None)
+            identity = identity or client_ip(request)
+
+            allowed, retry_after = await self.backend.hit(
+                f"rl:{service_name}:{policy.name}:{identity}",
+                policy.limit,
+                policy.window,
+            )
+            if not allowed:
+                self.rejected += 1
+                raise TooManyRequestsException(
+                    service_name=service_name,
+                    detail="Too many requests",
+                    retry_after=retry_after,
+                )
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "rejected": self.rejected,
+        }
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,195 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from core import settings
+
+from .clients import Upstream, parse_origins
+from .rate_limit import RateLimitPolicy
+from .response_cache import CachePolicy
+
+VARIABLE = re.compile(r"\$\{(\w+)(?::-([^}]*))?\}")
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+@dataclass
+class CompressionPolicy:
+    pattern: re.Pattern
+    # Encoding -> level, a level of 0 disables that encoding for the route.
+    levels: dict[str, int]
+
+
+@dataclass
+class Service:
+    name: str
+    prefix: str
+    upstream: Upstream
+    public_paths: frozenset[str] = frozenset()
+    # Paths the gateway never forwards, only reachable inside the network
+    internal_paths: list[re.Pattern] = field(default_factory=list)
+    streaming: bool = False
+    cache_policies: list[CachePolicy] = field(default_factory=list)
+    invalidations: set[tuple[str, str]] = field(default_factory=set)
+    rate_limits: list[RateLimitPolicy] = field(default_factory=list)
+    compression: list[CompressionPolicy] = field(default_factory=list)
+    # Load shedding class: critical, normal or bulk
+    priority: str = "normal"
+    priorities: list[tuple[re.Pattern, str]] = field(default_factory=list)
+    # Seconds until the upstream has to answer, see DeadlineMiddleware
+    deadline: float = settings.GATEWAY_REQUEST_TIMEOUT
+    deadlines: list[tuple[re.Pattern, float]] = field(default_factory=list)
+
+    def is_internal(self, path: str) -> bool:
+        return any(pattern.fullmatch(path) for pattern in self.internal_paths)
+
+    def deadline_for(self, path: str) -> float:
+        for pattern, deadline in self.deadlines:
+            if pattern.fullmatch(path):
+                return deadline
+        return self.deadline
+
+
+def expand(value):
+    """Substitute ${NAME} and ${NAME:-default} from the environment or settings."""
+
+    if isinstance(value, dict):
+        return {key: expand(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand(item) for item in value]
+    if not isinstance(value, str):
+        return value
+
+    def substitute(match: re.Match) -> str:
+        name, default = match.groups()
+        found = os.getenv(name)
+        if found is None:
+            found = getattr(settings, name, None)
+        if found is None:
+            found = default or ""
+        return str(found)
+
+    return VARIABLE.sub(substitute, value)
+
+
+def as_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def compile_service(raw: dict) -> Service:
+    prefix = raw["prefix"].strip("/")
+
+    upstream = Upstream(
+        name=raw["name"],
+        origins=parse_origins(raw.get("endpoints"), raw.get("host"), raw.get("port")),
+        base_path=raw.get("base_path", "").rstrip("/"),
+        timeouts={key: float(value) for key, value in raw.get("timeouts", {}).items()},
+    )
+
+    return Service(
+        name=raw["name"],
+        prefix=prefix,
+        upstream=upstream,
+        public_paths=frozenset(path.strip("/") for path in raw.get("public_paths", [])),
+        internal_paths=[
+            re.compile(pattern) for pattern in raw.get("internal_paths", [])
+        ],
+        streaming=as_bool(raw.get("streaming", False)),
+        cache_policies=[
+            CachePolicy(
+                pattern=re.compile(policy["pattern"]),
+                ttl=float(policy["ttl"]),
+                tag_field=policy.get("tag_field", "id"),
+            )
+            for policy in raw.get("cache", [])
+        ],
+        invalidations={
+            (method.upper(), path.strip("/"))
+            for method, path in raw.get("invalidate", [])
+        },
+        rate_limits=[
+            RateLimitPolicy(
+                name=policy["name"],
+                pattern=re.compile(policy["pattern"]),
+                limit=int(policy["limit"]),
+                window=float(policy["window"]),
+                key=policy.get("key", "ip"),
+                methods=(
+                    {method.upper() for method in policy["methods"]}
+                    if policy.get("methods")
+                    else None
+                ),
+            )
+            for policy in raw.get("rate_limits", [])
+        ],
+        compression=[
+            CompressionPolicy(
+                pattern=re.compile(policy["pattern"]),
+                levels={
+                    encoding: int(policy.get(encoding, default))
+                    for encoding, default in (
+                        ("gzip", settings.COMPRESSION_GZIP_LEVEL),
+                        ("br", settings.COMPRESSION_BROTLI_LEVEL),
+                        ("zstd", settings.COMPRESSION_ZSTD_LEVEL),
+                    )
+                },
+            )
+            for policy in raw.get("compression", [])
+        ],
+        priority=raw.get("priority", "normal"),
+        priorities=[
+            (re.compile(policy["pattern"]), policy["priority"])
+            for policy in raw.get("priorities", [])
+        ],
+        deadline=float(raw.get("deadline", settings.GATEWAY_REQUEST_TIMEOUT)),
+        deadlines=[
+            (re.compile(policy["pattern"]), float(policy["deadline"]))
+            for policy in raw.get("deadlines", [])
+        ],
+    )
+
+
+class ServiceRegistry:
+    def __init__(self, services: list[Service], public_paths: set[str] = ()):
+        # Services without any upstream configured are left out, so their
+        # prefix answers 404 instead of failing on every request.
+        self._services = {
+            service.prefix: service for service in services if service.upstream.origins
+        }
+        self.public_paths = set(public_paths)
+        for service in self._services.values():
+            self.public_paths.update(
+                f"/{service.prefix}/{path}" for path in service.public_paths
+            )
+
+    @classmethod
+    def load(cls, path: str | Path = settings.SERVICE_REGISTRY_PATH):
+        with open(path) as file:
+            raw = expand(json.load(file))
+
+        return cls(
+            services=[compile_service(service) for service in raw["services"]],
+            public_paths=raw.get("public_paths", []),
+        )
+
+    def __contains__(self, prefix: str) -> bool:
+        return prefix in self._services
+
+    def __iter__(self):
+        return iter(self._services.values())
+
+    def get(self, prefix: str) -> Service | None:
+        return self._services.get(prefix)
+
+    def is_public(self, path: str) -> bool:
+        return path in self.public_paths
+
+    def upstreams(self) -> dict[str, Upstream]:
+        return {service.name: service.upstream for service in self._services.values()}
+
+
+registry = ServiceRegistry.load()
@@ -0,0 +1,53 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass
+class RequestStats:
+    upstream_ns: int = 0
+    upstream_calls: int = 0
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def record_upstream(elapsed_ns: int):
+    stats = request_stats.get()
+    if stats is not None:
+        stats.upstream_ns += elapsed_ns
+        stats.upstream_calls += 1
+
+
+# Remaining time budget in milliseconds, sent to upstreams and accepted from
+# clients that want a shorter deadline.
+DEADLINE_HEADER = "x-request-timeout-ms"
+
+
+@dataclass
+class Deadline:
+    # Budget of the route in seconds
+    budget: float
+    # Absolute deadline asked for by the client, the budget never exceeds it
+    limit: float | None = None
+    at: float = 0.0
+
+    def start(self) -> float:
+        self.at = time.monotonic() + self.budget
+        if self.limit is not None:
+            self.at = min(self.at, self.limit)
+        return self.at
+
+
+request_deadline: ContextVar[Deadline | None] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def remaining_budget() -> float | None:
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline.at - time.monotonic()
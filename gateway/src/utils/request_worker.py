@@ -1,36 +1,264 @@
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
 import httpx
-from exceptions.http_exceptions import GatewayException
-from fastapi import HTTPException, Response
-from httpx import AsyncClient
+from core import json_field, settings
+from exceptions.http_exceptions import (
+    BadGatewayException,
+    GatewayException,
+    GatewayTimeoutException,
+    PayloadTooLargeException,
+    ServiceUnavailableException,
+)
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from .balancer import Endpoint, balancers
+from .circuit_breaker import breakers
+from .clients import clients
+from .metrics import upstream_errors, upstream_metrics
+from .request_context import record_upstream, remaining_budget, request_deadline
+from .retry import IDEMPOTENT_METHODS, retries
+from .singleflight import singleflight
+from .tracing import tracer
+
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+}
+
+COALESCED_METHODS = {"GET", "HEAD"}
+
+# Headers that can change an upstream answer; requests that differ in any
+# of them are never merged.
+COALESCED_HEADERS = (
+    "authorization",
+    "user_id",
+    "accept",
+    "accept-encoding",
+    "x-read-consistency",
+)
+
+
+def error_detail(response: httpx.Response) -> str:
+    return json_field(response.content, "detail", response.text)
+
+
+def check_body_size(request: Request, service_name: str):
+    content_length = request.headers.get("content-length")
+
+    if content_length and int(content_length) > settings.PROXY_MAX_BODY_SIZE:
+        raise PayloadTooLargeException(
+            service_name=service_name, detail="Request body too large"
+        )
+
+
+async def read_body(request: Request, service_name: str) -> bytes:
+    check_body_size(request=request, service_name=service_name)
+
+    body = await request.body()
+
+    if len(body) > settings.PROXY_MAX_BODY_SIZE:
+        raise PayloadTooLargeException(
+            service_name=service_name, detail="Request body too large"
+        )
+
+    return body
+
+
+async def stream_body(request: Request, service_name: str) -> AsyncIterator[bytes]:
+    check_body_size(request=request, service_name=service_name)
+
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > settings.PROXY_MAX_BODY_SIZE:
+            raise PayloadTooLargeException(
+                service_name=service_name, detail="Request body too large"
+            )
+        yield chunk
+
+
+class StreamedUpload:
+    """Request body that starts the deadline once it has been sent.
+
+    Until then only the client's write timeout bounds the upload, so the
+    deadline covers the wait for the upstream's first byte, not the body.
+    """
+
+    def __init__(self, body: AsyncIterator[bytes]):
+        self.body = body
+        self.timeout: asyncio.Timeout | None = None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.body:
+            yield chunk
+
+        deadline = request_deadline.get()
+        if deadline is None or self.timeout is None:
+            return
+
+        deadline.start()
+        self.timeout.reschedule(asyncio.get_running_loop().time() + remaining_budget())
+
+
+def coalesce_key(service_name: str, method: str, endpoint: str, headers=None):
+    headers = {key.lower(): value for key, value in (headers or {}).items()}
+
+    return (
+        service_name,
+        method.upper(),
+        endpoint,
+        *(headers.get(name) for name in COALESCED_HEADERS),
+    )
+
+
+async def attempt_upstream(
+    service_name: str,
+    send: Callable[[str], Awaitable[httpx.Response]],
+    endpoint: Endpoint,
+    upload: StreamedUpload | None = None,
+) -> httpx.Response | None:
+    remaining = remaining_budget()
+    if remaining is not None and remaining <= 0:
+        raise GatewayTimeoutException(
+            service_name=service_name, detail="Deadline exceeded"
+        )
+
+    breaker = breakers.get(service_name)
+    try:
+        breaker.before_call()
+    except ServiceUnavailableException:
+        upstream_errors(service_name, "circuit_open").inc()
+        raise
+
+    latency, in_flight = upstream_metrics(service_name)
+    endpoint.in_flight += 1
+    in_flight.inc()
+    started = time.perf_counter_ns()
+    try:
+        with tracer.span(
+            "upstream.request", service=service_name, endpoint=endpoint.base_url
+        ) as span:
+            try:
+                async with asyncio.timeout(
+                    None if upload is not None else remaining
+                ) as timeout:
+                    if upload is not None:
+                        upload.timeout = timeout
+                    response = await send(endpoint.base_url)
+            except (httpx.RequestError, TimeoutError) as exc:
+                span.status = "error"
+                span.set_attribute("error", type(exc).__name__)
+                response = None
+            else:
+                span.set_attribute("http.status_code", response.status_code)
+    except BaseException:
+        breaker.release()
+        raise
+    finally:
+        endpoint.in_flight -= 1
+        in_flight.dec()
+
+    elapsed = time.perf_counter_ns() - started
+    record_upstream(elapsed)
+    latency.observe(elapsed / 1e9)
+
+    failed = response is None or response.status_code >= 500
+    endpoint.record(failed=failed)
+    breaker.record(failed=failed, latency=elapsed / 1e9)
+
+    if response is None:
+        upstream_errors(service_name, "transport").inc()
+    elif failed:
+        upstream_errors(service_name, "server_error").inc()
+    else:
+        retries.observe(service_name, elapsed / 1e9)
+
+    return response
+
+
+async def call_upstream(
+    service_name: str,
+    send: Callable[[str], Awaitable[httpx.Response]],
+    error_message: str = "Request forward error",
+    method: str | None = None,
+    upload: StreamedUpload | None = None,
+) -> httpx.Response:
+    """Send through a picked replica; idempotent methods are retried."""
+
+    balancer = balancers.get(service_name)
+
+    if method is not None and method.upper() in IDEMPOTENT_METHODS:
+        _, response = await retries.run(
+            service_name,
+            method.upper(),
+            balancer.pick,
+            lambda endpoint: attempt_upstream(service_name, send, endpoint),
+        )
+    else:
+        response = await attempt_upstream(
+            service_name, send, balancer.pick(), upload=upload
+        )
+
+    if response is None:
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise GatewayTimeoutException(
+                service_name=service_name, detail="Deadline exceeded"
+            )
+        raise GatewayException(service_name=service_name, detail=error_message)
+
+    return response
+
+
+async def send_request(
+    method: str,
+    endpoint: str,
+    service_name: str,
+    headers=None,
+    body=None,
+) -> httpx.Response:
+    client = clients.get(service_name)
+
+    response = await call_upstream(
+        service_name,
+        lambda base_url: client.request(
+            method=method.upper(),
+            url=f"{base_url}/{endpoint}",
+            headers=headers,
+            content=body,
+        ),
+        method=method,
+    )
+
+    if response.status_code >= 400:
+        raise GatewayException(service_name=service_name, detail=error_detail(response))
+
+    return response
 
 
 async def forward_request(
     method: str,
-    base_url: str,
     endpoint: str,
     service_name: str,
     headers=None,
     body=None,
 ):
-    async with AsyncClient(base_url=base_url) as client:
-        response = None
-        try:
-            response = await client.request(
-                method=method.upper(),
-                url=endpoint,
-                headers=headers,
-                content=body,
-            )
-        except httpx.RequestError:
-            raise GatewayException(
-                service_name=service_name, detail="Request forward error"
-            )
-    if response.status_code >= 400:
-        try:
-            detail = response.json().get("detail", response.text)
-        except Exception:
-            detail = response.text
-        raise GatewayException(service_name=service_name, detail=detail)
+    if method.upper() in COALESCED_METHODS:
+        response = await singleflight.do(
+            coalesce_key(service_name, method, endpoint, headers),
+            lambda: send_request(method, endpoint, service_name, headers),
+        )
+    else:
+        response = await send_request(method, endpoint, service_name, headers, body)
 
     return Response(
         content=response.content,
@@ -38,3 +266,56 @@ async def forward_request(
         headers=dict(response.headers),
         media_type=response.headers.get("content-type"),
     )
+
+
+async def forward_stream_request(
+    method: str,
+    endpoint: str,
+    service_name: str,
+    headers=None,
+    body: AsyncIterator[bytes] | None = None,
+):
+    client = clients.get(service_name)
+    upload = StreamedUpload(body) if body is not None else None
+
+    def send(base_url: str) -> Awaitable[httpx.Response]:
+        upstream_request = client.build_request(
+            method=method.upper(),
+            url=f"{base_url}/{endpoint}",
+            headers=headers,
+            content=upload,
+        )
+        return client.send(upstream_request, stream=True)
+
+    # The request body may be a one-shot stream, so streamed calls are
+    # never retried.
+    response = await call_upstream(service_name, send, upload=upload)
+
+    if response.status_code >= 400:
+        try:
+            await response.aread()
+        except httpx.RequestError:
+            # The body never arrived, there is no detail to pass on.
+            raise BadGatewayException(
+                service_name=service_name, detail="Upstream error response unreadable"
+            )
+        finally:
+            await response.aclose()
+        raise GatewayException(service_name=service_name, detail=error_detail(response))
+
+    async def relay() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in response.aiter_raw():
+                yield chunk
+        finally:
+            await response.aclose()
+
+    return StreamingResponse(
+        content=relay(),
+        status_code=response.status_code,
+        headers={
+            key: value
+            for key, value in response.headers.items()
+            if key.lower() not in HOP_BY_HOP_HEADERS
+        },
+    )
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+
+import httpx
+from core import json_field, settings
+from fastapi import Response
+
+from .cache_backends import build_backend
+from .request_worker import HOP_BY_HOP_HEADERS, coalesce_key, send_request
+from .singleflight import singleflight
+
+UNCACHEABLE_DIRECTIVES = {"no-store", "no-cache", "private"}
+
+# Asks user-service to read from the primary instead of a replica.
+READ_CONSISTENCY_HEADER = "x-read-consistency"
+
+
+@dataclass
+class CachePolicy:
+    pattern: re.Pattern
+    ttl: float
+    # Field of the JSON body that owns the entry, used for invalidation.
+    tag_field: str | None = "id"
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: dict
+    content: bytes
+
+    @property
+    def etag(self) -> str:
+        return self.headers["etag"]
+
+    def dump(self) -> bytes:
+        meta = json.dumps({"status_code": self.status_code, "headers": self.headers})
+        return meta.encode() + b"\n" + self.content
+
+    @classmethod
+    def load(cls, raw: bytes) -> "CachedResponse":
+        meta, content = raw.split(b"\n", 1)
+        meta = json.loads(meta)
+        return cls(meta["status_code"], meta["headers"], content)
+
+
+def find_policy(policies: list[CachePolicy], path: str) -> CachePolicy | None:
+    for policy in policies:
+        if policy.pattern.fullmatch(path):
+            return policy
+    return None
+
+
+def cache_control(headers) -> dict[str, str | None]:
+    directives = {}
+    for item in headers.get("cache-control", "").split(","):
+        name, _, value = item.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    etag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    def __init__(self, backend=None):
+        self.backend = backend or build_backend()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def ttl_for(self, response: httpx.Response, policy: CachePolicy) -> float:
+        directives = cache_control(response.headers)
+        if UNCACHEABLE_DIRECTIVES & directives.keys():
+            return 0
+
+        max_age = directives.get("s-maxage") or directives.get("max-age")
+        if max_age is not None and max_age.isdigit():
+            return min(policy.ttl, int(max_age))
+        return policy.ttl
+
+    async def get(self, key: str) -> CachedResponse | None:
+        raw = await self.backend.get("response:" + key)
+        return CachedResponse.load(raw) if raw is not None else None
+
+    async def store(
+        self,
+        key: str,
+        response: httpx.Response,
+        policy: CachePolicy,
+        from_primary: bool = False,
+    ) -> CachedResponse:
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name not in HOP_BY_HOP_HEADERS and name != "content-length"
+        }
+        if "etag" not in headers:
+            digest = hashlib.sha1(response.content).hexdigest()
+            headers["etag"] = f'W/"{digest}"'
+
+        cached = CachedResponse(response.status_code, headers, response.content)
+
+        ttl = self.ttl_for(response, policy)
+        if ttl <= 0 or len(response.content) > settings.RESPONSE_CACHE_MAX_ENTRY_BYTES:
+            return cached
+
+        # A replica may not have the owner's last write yet; caching its
+        # answer would pin the stale row for the whole TTL.
+        tag = self.tag_for(response, policy)
+        if tag is not None and not from_primary and await self.recently_written(tag):
+            return cached
+
+        await self.backend.set("response:" + key, cached.dump(), ttl)
+
+        if tag is not None:
+            await self.add_to_tag(tag, key, ttl)
+
+        return cached
+
+    def tag_for(self, response: httpx.Response, policy: CachePolicy) -> str | None:
+        if policy.tag_field is None:
+            return None
+
+        tag = json_field(response.content, policy.tag_field)
+        return str(tag) if tag is not None else None
+
+    async def add_to_tag(self, tag: str, key: str, ttl: float):
+        raw = await self.backend.get("tag:" + tag)
+        keys = set(json.loads(raw)) if raw else set()
+        keys.add(key)
+        await self.backend.set("tag:" + tag, json.dumps(sorted(keys)).encode(), ttl)
+
+    async def mark_written(self, tag: str | None):
+        if tag is None:
+            return
+
+        await self.backend.set("written:" + tag, b"1", settings.READ_YOUR_WRITES_WINDOW)
+
+    async def recently_written(self, tag: str | None) -> bool:
+        if tag is None:
+            return False
+
+        return await self.backend.get("written:" + tag) is not None
+
+    async def invalidate_tag(self, tag: str | None):
+        if tag is None:
+            return
+
+        await self.mark_written(tag)
+
+        raw = await self.backend.get("tag:" + tag)
+        if not raw:
+            return
+
+        keys = json.loads(raw)
+        await self.backend.delete("tag:" + tag, *("response:" + key for key in keys))
+        self.invalidations += 1
+
+    def respond(self, cached: CachedResponse, if_none_match: str | None, state: str):
+        if etag_matches(if_none_match, cached.etag):
+            self.not_modified += 1
+            headers = {
+                name: value
+                for name, value in cached.headers.items()
+                if name in ("etag", "cache-control", "vary")
+            }
+            headers["x-cache"] = state
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=cached.content,
+            status_code=cached.status_code,
+            headers={**cached.headers, "x-cache": state},
+            media_type=cached.headers.get("content-type"),
+        )
+
+    async def forward(
+        self,
+        endpoint: str,
+        service_name: str,
+        policy: CachePolicy,
+        headers: dict,
+    ) -> Response:
+        key = f"{service_name}:{endpoint}"
+        if_none_match = headers.get("if-none-match")
+
+        if "no-cache" not in cache_control(headers):
+            cached = await self.get(key)
+            if cached is not None:
+                self.hits += 1
+                return self.respond(cached, if_none_match, "HIT")
+
+        self.misses += 1
+
+        # The upstream always gets a full GET, validators belong to the client.
+        upstream_headers = {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in ("if-none-match", "if-modified-since")
+        }
+        response = await singleflight.do(
+            coalesce_key(service_name, "GET", endpoint, upstream_headers),
+            lambda: send_request("GET", endpoint, service_name, upstream_headers),
+        )
+        cached = await self.store(
+            key,
+            response,
+            policy,
+            from_primary=headers.get(READ_CONSISTENCY_HEADER) == "primary",
+        )
+
+        return self.respond(cached, if_none_match, "MISS")
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+        }
+
+
+response_cache = ResponseCache()
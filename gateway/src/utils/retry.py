@@ -0,0 +1,181 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+import httpx
+from core import settings
+
+from .balancer import Endpoint
+from .metrics import upstream_retries
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+HEDGED_METHODS = {"GET", "HEAD"}
+RETRYABLE_STATUS = {502, 503, 504}
+
+Attempt = Callable[[Endpoint], Awaitable[httpx.Response | None]]
+Pick = Callable[[Endpoint | None], Endpoint]
+
+
+def retryable(response: httpx.Response | None) -> bool:
+    return response is None or response.status_code in RETRYABLE_STATUS
+
+
+def backoff(retry: int) -> float:
+    # Full jitter keeps retries of concurrent requests from synchronising.
+    ceiling = min(
+        settings.RETRY_BACKOFF_MAX, settings.RETRY_BACKOFF_BASE * 2 ** (retry - 1)
+    )
+    return random.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """Retries may add RETRY_BUDGET_RATIO of the request volume on top of a
+    small per-second reserve, so an outage is never multiplied by retries."""
+
+    def __init__(self):
+        self.balance = float(settings.RETRY_BUDGET_BURST)
+        self._updated = time.monotonic()
+
+    def deposit(self):
+        self._refill()
+        self.balance = min(
+            self.balance + settings.RETRY_BUDGET_RATIO, settings.RETRY_BUDGET_BURST
+        )
+
+    def withdraw(self) -> bool:
+        self._refill()
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+    def _refill(self):
+        now = time.monotonic()
+        self.balance = min(
+            self.balance + (now - self._updated) * settings.RETRY_BUDGET_MIN_PER_SECOND,
+            settings.RETRY_BUDGET_BURST,
+        )
+        self._updated = now
+
+
+class LatencyTracker:
+    def __init__(self):
+        self._samples: deque[float] = deque(maxlen=settings.HEDGE_SAMPLES)
+        self._pending = 0
+        self._percentile: float | None = None
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+        self._pending += 1
+
+    def hedge_delay(self) -> float | None:
+        if len(self._samples) < settings.HEDGE_MIN_SAMPLES:
+            return None
+
+        # Sorting is cheap at this size but there is no need to do it on
+        # every request.
+        if self._percentile is None or self._pending >= settings.HEDGE_MIN_SAMPLES:
+            ordered = sorted(self._samples)
+            index = min(int(len(ordered) * settings.HEDGE_PERCENTILE), len(ordered) - 1)
+            self._percentile = ordered[index]
+            self._pending = 0
+
+        return max(self._percentile, settings.HEDGE_MIN_DELAY)
+
+
+class RetryPolicy:
+    def __init__(self):
+        self._budgets: dict[str, RetryBudget] = {}
+        self._latencies: dict[str, LatencyTracker] = {}
+
+    def budget(self, service_name: str) -> RetryBudget:
+        budget = self._budgets.get(service_name)
+        if budget is None:
+            budget = self._budgets[service_name] = RetryBudget()
+        return budget
+
+    def latency(self, service_name: str) -> LatencyTracker:
+        tracker = self._latencies.get(service_name)
+        if tracker is None:
+            tracker = self._latencies[service_name] = LatencyTracker()
+        return tracker
+
+    def observe(self, service_name: str, seconds: float):
+        self.latency(service_name).observe(seconds)
+
+    async def run(
+        self, service_name: str, method: str, pick: Pick, attempt: Attempt
+    ) -> tuple[Endpoint, httpx.Response | None]:
+        budget = self.budget(service_name)
+        budget.deposit()
+        hedge = settings.HEDGE_ENABLED and method in HEDGED_METHODS
+
+        exclude = None
+        # The first attempt is not a retry, it is made whatever the setting.
+        for retry in range(max(1, settings.RETRY_MAX_ATTEMPTS)):
+            if retry:
+                if not budget.withdraw():
+                    break
+                upstream_retries(service_name, "retry").inc()
+                await asyncio.sleep(backoff(retry))
+
+            if hedge:
+                endpoint, response = await self.hedged(
+                    service_name, budget, pick, attempt, exclude
+                )
+            else:
+                endpoint = pick(exclude)
+                response = await attempt(endpoint)
+
+            if not retryable(response):
+                break
+            # Try another replica next time, if there is one.
+            exclude = endpoint
+
+        return endpoint, response
+
+    async def hedged(
+        self,
+        service_name: str,
+        budget: RetryBudget,
+        pick: Pick,
+        attempt: Attempt,
+        exclude: Endpoint | None,
+    ) -> tuple[Endpoint, httpx.Response | None]:
+        first = pick(exclude)
+        delay = self.latency(service_name).hedge_delay()
+        if delay is None:
+            return first, await attempt(first)
+
+        tasks = {asyncio.ensure_future(attempt(first)): first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and budget.withdraw():
+                upstream_retries(service_name, "hedge").inc()
+                second = pick(first)
+                tasks[asyncio.ensure_future(attempt(second))] = second
+
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    endpoint = tasks.pop(task)
+                    response = task.result()
+                    if not retryable(response) or not tasks:
+                        return endpoint, response
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "budget": round(budget.balance, 2),
+                "hedge_delay": self.latency(name).hedge_delay(),
+            }
+            for name, budget in self._budgets.items()
+        }
+
+
+retries = RetryPolicy()
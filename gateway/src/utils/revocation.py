@@ -0,0 +1,93 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from core import settings
+from exceptions import AppException
+
+from .clients import clients
+from .request_worker import call_upstream
+
+
+class RevocationCache:
+    def __init__(self):
+        self._revoked: dict[str, datetime] = {}
+        self._since: str | None = None
+        self._synced_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def is_revoked(self, token_id: str) -> bool:
+        return token_id in self._revoked
+
+    def is_fresh(self) -> bool:
+        if self._synced_at is None:
+            return False
+
+        return (
+            time.monotonic() - self._synced_at <= settings.AUTH_REVOCATION_MAX_STALENESS
+        )
+
+    async def sync(self):
+        client = clients.get("user_service")
+        params = {"since": self._since} if self._since else None
+        headers = {"x-admin-key": settings.ADMIN_API_KEY}
+
+        response = await call_upstream(
+            "user_service",
+            lambda base_url: client.get(
+                f"{base_url}/auth/revoked", params=params, headers=headers
+            ),
+            method="GET",
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        until = datetime.fromisoformat(data["until"])
+        for token_id in data["revoked"]:
+            self._revoked[token_id] = until
+
+        # Access tokens live at most ACCESS_TOKEN_EXPIRE_HOURS, so older
+        # revocations can no longer match a valid signature.
+        horizon = until - timedelta(hours=settings.ACCESS_TOKEN_EXPIRE_HOURS)
+        self._revoked = {
+            token_id: seen_at
+            for token_id, seen_at in self._revoked.items()
+            if seen_at > horizon
+        }
+
+        overlap = timedelta(seconds=settings.AUTH_REVOCATION_SYNC_OVERLAP)
+        self._since = (until - overlap).isoformat()
+        self._synced_at = time.monotonic()
+
+    async def run(self):
+        while True:
+            try:
+                await self.sync()
+            except (AppException, httpx.HTTPError, KeyError, ValueError) as e:
+                print(f"WARNING:  Revocation sync failed: {e!r}")
+            await asyncio.sleep(settings.AUTH_REVOCATION_SYNC_INTERVAL)
+
+    def start(self):
+        if not settings.SECRET_KEY or not settings.ALGORITHM:
+            print("WARNING:  SECRET_KEY/ALGORITHM not set, local token checks off")
+            return
+        if not settings.ADMIN_API_KEY:
+            print("WARNING:  ADMIN_API_KEY not set, local token checks off")
+            return
+
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+revocation_cache = RevocationCache()
@@ -0,0 +1,218 @@
+import errno
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+from contextlib import contextmanager
+
+from core import settings
+
+MAGIC = b"GWSHM001"
+HEADER = struct.Struct("<8sII")
+HEADER_SIZE = 64
+
+# seq, key digest, expires_at, value length. An odd seq means a write is in
+# progress (seqlock), readers retry instead of taking a lock.
+SLOT = struct.Struct("<I16sdI")
+SEQ = struct.Struct("<I")
+EMPTY_KEY = bytes(16)
+
+# Slots per bucket, a key lives in one of the slots of its bucket.
+WAYS = 4
+READ_RETRIES = 8
+
+
+def digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+class SharedHashTable:
+    """Fixed-size hash table in a shared mmap, one per host for all workers.
+
+    Reads are lock-free, writes take an fcntl lock on the bucket's stripe
+    without waiting for it: a busy stripe skips the set, which only costs a
+    later miss, and leaves the key to the caller of delete() to retry.
+    Expiry uses time.monotonic(), which is system-wide on Linux. Full
+    buckets evict the entry closest to expiry.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        slots: int,
+        value_size: int,
+        stripes: int = settings.SHARED_CACHE_STRIPES,
+        directory: str = settings.SHARED_CACHE_DIR,
+    ):
+        self.buckets = max(slots // WAYS, 1)
+        self.slots = self.buckets * WAYS
+        self.value_size = value_size
+        self.stripes = stripes
+        self.stride = SLOT.size + value_size
+        self.size_bytes = HEADER_SIZE + self.slots * self.stride
+        self.path = os.path.join(
+            directory, f"{settings.SHARED_CACHE_NAMESPACE}-{name}.shm"
+        )
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._locked(0, HEADER_SIZE):
+                self._init_file()
+            self._map = mmap.mmap(self._fd, self.size_bytes)
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _init_file(self):
+        if os.fstat(self._fd).st_size == 0:
+            os.ftruncate(self._fd, self.size_bytes)
+            os.pwrite(self._fd, HEADER.pack(MAGIC, self.slots, self.value_size), 0)
+            return
+
+        magic, slots, value_size = HEADER.unpack(os.pread(self._fd, HEADER.size, 0))
+        if (magic, slots, value_size) != (MAGIC, self.slots, self.value_size):
+            raise RuntimeError(
+                f"{self.path} has a different layout, remove it or change "
+                "SHARED_CACHE_NAMESPACE"
+            )
+
+    @contextmanager
+    def _locked(self, offset: int, length: int = 1):
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, length, offset)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
+
+    def _try_lock(self, offset: int) -> bool:
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset)
+        except OSError as exc:
+            if exc.errno in (errno.EACCES, errno.EAGAIN):
+                return False
+            raise
+        return True
+
+    def _unlock(self, offset: int):
+        fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, offset)
+
+    def _stripe(self, bucket: int) -> int:
+        # Stripe locks live past the end of the file, away from the header lock.
+        return self.size_bytes + bucket % self.stripes
+
+    def _bucket(self, key_digest: bytes) -> int:
+        return int.from_bytes(key_digest[:8], "little") % self.buckets
+
+    def _offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * self.stride
+
+    def _read_slot(self, offset: int) -> tuple[bytes, float, bytes | None] | None:
+        for _ in range(READ_RETRIES):
+            seq, key_digest, expires_at, length = SLOT.unpack_from(self._map, offset)
+            if seq & 1:
+                continue
+
+            value = None
+            if key_digest != EMPTY_KEY:
+                start = offset + SLOT.size
+                value = self._map[start : start + min(length, self.value_size)]
+
+            if SEQ.unpack_from(self._map, offset)[0] == seq:
+                return key_digest, expires_at, value
+
+        # Lost every race against writers, treat as a miss.
+        return None
+
+    def _write_slot(self, offset: int, key_digest: bytes, expires_at: float, value):
+        (seq,) = SEQ.unpack_from(self._map, offset)
+        # Odd whatever the last writer left, one that died mid-write must
+        # not flip the parity for every later write.
+        writing = seq | 1
+        SEQ.pack_into(self._map, offset, writing)
+        start = offset + SLOT.size
+        self._map[start : start + len(value)] = value
+        SLOT.pack_into(self._map, offset, writing, key_digest, expires_at, len(value))
+        SEQ.pack_into(self._map, offset, (writing + 1) & 0xFFFFFFFF)
+
+    def get(self, key: str) -> bytes | None:
+        key_digest = digest(key)
+        first = self._bucket(key_digest) * WAYS
+        now = time.monotonic()
+
+        for slot in range(first, first + WAYS):
+            entry = self._read_slot(self._offset(slot))
+            if entry is not None and entry[0] == key_digest:
+                return entry[2] if entry[1] > now else None
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> bool:
+        if len(value) > self.value_size or ttl <= 0:
+            return False
+
+        key_digest = digest(key)
+        bucket = self._bucket(key_digest)
+        first = bucket * WAYS
+        now = time.monotonic()
+
+        stripe = self._stripe(bucket)
+        if not self._try_lock(stripe):
+            return False
+        try:
+            victim, victim_expiry = first, None
+            for slot in range(first, first + WAYS):
+                _, slot_digest, expires_at, _ = SLOT.unpack_from(
+                    self._map, self._offset(slot)
+                )
+                if slot_digest == key_digest:
+                    victim = slot
+                    break
+                if slot_digest == EMPTY_KEY or expires_at <= now:
+                    expires_at = float("-inf")
+                if victim_expiry is None or expires_at < victim_expiry:
+                    victim, victim_expiry = slot, expires_at
+
+            self._write_slot(self._offset(victim), key_digest, now + ttl, value)
+        finally:
+            self._unlock(stripe)
+        return True
+
+    def delete(self, *keys: str) -> list[str]:
+        """Delete keys, returns those whose stripe was busy."""
+
+        busy = []
+        for key in keys:
+            key_digest = digest(key)
+            bucket = self._bucket(key_digest)
+            first = bucket * WAYS
+
+            stripe = self._stripe(bucket)
+            if not self._try_lock(stripe):
+                busy.append(key)
+                continue
+            try:
+                for slot in range(first, first + WAYS):
+                    offset = self._offset(slot)
+                    if SLOT.unpack_from(self._map, offset)[1] == key_digest:
+                        self._write_slot(offset, EMPTY_KEY, 0.0, b"")
+            finally:
+                self._unlock(stripe)
+        return busy
+
+    def __len__(self) -> int:
+        now = time.monotonic()
+        size = 0
+        for slot in range(self.slots):
+            _, key_digest, expires_at, _ = SLOT.unpack_from(
+                self._map, self._offset(slot)
+            )
+            if key_digest != EMPTY_KEY and expires_at > now:
+                size += 1
+        return size
+
+    def close(self):
+        # The file stays behind for the other workers.
+        if not self._map.closed:
+            self._map.close()
+            os.close(self._fd)
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+import jwt
+from core import settings
+
+from .shared_memory import SharedHashTable
+
+# Slot size of the shared table, fits a user id or a short error detail.
+SHARED_ENTRY_BYTES = 512
+
+
+@dataclass
+class TokenCacheEntry:
+    expires_at: float
+    user_id: str | None = None
+    detail: str | None = None
+
+
+class TokenCache:
+    def __init__(
+        self,
+        max_size: int = settings.AUTH_CACHE_MAX_SIZE,
+        ttl: float = settings.AUTH_CACHE_TTL,
+        negative_ttl: float = settings.AUTH_CACHE_NEGATIVE_TTL,
+        table: SharedHashTable | None = None,
+    ):
+        self.max_size = max_size
+        # Entries go to the shared table when one is given.
+        self.table = table
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, TokenCacheEntry] = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def token_lifetime(token: str) -> float | None:
+        try:
+            payload = jwt.decode(
+                token.removeprefix("Bearer "),
+                options={"verify_signature": False},
+            )
+        except jwt.InvalidTokenError:
+            return None
+
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return None
+
+        return exp - time.time()
+
+    def get(self, token: str) -> TokenCacheEntry | None:
+        key = self.key(token)
+        entry = self._load(key)
+
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None and self.table is None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        if self.table is None:
+            self._entries.move_to_end(key)
+        if entry.user_id is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+
+        return entry
+
+    def set_valid(self, token: str, user_id: str):
+        lifetime = self.token_lifetime(token)
+        if lifetime is None or lifetime <= 0:
+            return
+
+        ttl = min(self.ttl, lifetime)
+        self._put(token, TokenCacheEntry(time.monotonic() + ttl, user_id=user_id))
+
+    def set_invalid(self, token: str, detail: str):
+        ttl = self.negative_ttl
+        self._put(token, TokenCacheEntry(time.monotonic() + ttl, detail=detail))
+
+    def _load(self, key: str) -> TokenCacheEntry | None:
+        if self.table is None:
+            return self._entries.get(key)
+
+        raw = self.table.get(key)
+        return TokenCacheEntry(**json.loads(raw)) if raw is not None else None
+
+    def _put(self, token: str, entry: TokenCacheEntry):
+        key = self.key(token)
+        if self.table is not None:
+            raw = json.dumps(asdict(entry)).encode()
+            self.table.set(key, raw, entry.expires_at - time.monotonic())
+            return
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.table if self.table is not None else self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        if self.table is not None:
+            self.table.close()
+
+
+def build_table(kind: str = settings.AUTH_CACHE_BACKEND) -> SharedHashTable | None:
+    if kind == "memory":
+        return None
+    if kind == "shm":
+        return SharedHashTable(
+            name="tokens",
+            slots=settings.AUTH_CACHE_MAX_SIZE,
+            value_size=SHARED_ENTRY_BYTES,
+        )
+
+    raise ValueError(f"Unknown token cache backend: {kind}")
+
+
+token_cache = TokenCache(table=build_table())
@@ -0,0 +1,26 @@
+from core import settings
+from tracing import (
+    TRACEPARENT,
+    InMemoryExporter,
+    Tracer,
+    TracingMiddleware,
+    build_exporter,
+    current_span,
+    parse_traceparent,
+)
+
+__all__ = [
+    "TRACEPARENT",
+    "InMemoryExporter",
+    "Tracer",
+    "TracingMiddleware",
+    "current_span",
+    "parse_traceparent",
+    "tracer",
+]
+
+tracer = Tracer(
+    exporter=build_exporter(settings.TRACE_EXPORTER, settings.TRACE_FILE),
+    service=settings.TRACE_SERVICE_NAME,
+    sample_rate=settings.TRACE_SAMPLE_RATE,
+)
@@ -0,0 +1,33 @@
+import os
+
+# Settings are read on import, the required ones get test values first.
+os.environ.setdefault("PROJECT_NAME", "gateway")
+os.environ.setdefault("USER_SERVICE_HOST", "localhost")
+os.environ.setdefault("USER_SERVICE_PORT", "8001")
+os.environ.setdefault("USER_SERVICE_VERSION", "v1")
+
+import pytest  # noqa: E402
+
+
+class Clock:
+    """Stands in for the time module of the code under test."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
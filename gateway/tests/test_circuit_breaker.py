@@ -0,0 +1,136 @@
+import math
+
+import pytest
+from core import settings
+from exceptions.http_exceptions import ServiceUnavailableException
+from src.utils import circuit_breaker
+from src.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+from .conftest import Clock
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock(1000.0)
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock) -> CircuitBreaker:
+    monkeypatch.setattr(settings, "BREAKER_MIN_CALLS", 4)
+    monkeypatch.setattr(settings, "BREAKER_HALF_OPEN_CALLS", 2)
+    return CircuitBreaker("users")
+
+
+def record(breaker: CircuitBreaker, failed: int = 0, ok: int = 0, latency=0.01):
+    for _ in range(ok):
+        breaker.before_call()
+        breaker.record(failed=False, latency=latency)
+    for _ in range(failed):
+        breaker.before_call()
+        breaker.record(failed=True, latency=latency)
+
+
+def open_breaker(breaker: CircuitBreaker):
+    record(breaker, failed=4)
+    assert breaker.state == OPEN
+
+
+class TestClosed:
+    def test_waits_for_enough_calls(self, breaker):
+        record(breaker, failed=3)
+
+        assert breaker.state == CLOSED
+
+    def test_opens_at_the_error_rate(self, breaker):
+        record(breaker, ok=2, failed=2)
+
+        assert breaker.state == OPEN
+
+    def test_stays_closed_below_the_error_rate(self, breaker):
+        record(breaker, ok=3, failed=2)
+
+        assert breaker.state == CLOSED
+
+    def test_opens_at_the_slow_call_rate(self, breaker):
+        record(breaker, ok=4, latency=settings.BREAKER_SLOW_CALL_SECONDS)
+
+        assert breaker.state == OPEN
+
+    def test_forgets_calls_older_than_the_window(self, breaker, clock):
+        record(breaker, failed=3)
+        clock.advance(settings.BREAKER_WINDOW + 1)
+
+        record(breaker, ok=3, failed=1)
+
+        assert breaker.state == CLOSED
+        assert breaker.stats()["calls"] == 4
+
+
+class TestOpen:
+    def test_rejects_with_the_time_left(self, breaker, clock):
+        open_breaker(breaker)
+        clock.advance(2.5)
+
+        with pytest.raises(ServiceUnavailableException) as exc:
+            breaker.before_call()
+
+        # Rounded up, the client must not come back before the circuit half-opens.
+        retry_after = math.ceil(settings.BREAKER_OPEN_SECONDS - 2.5)
+        assert exc.value.headers["Retry-After"] == str(retry_after)
+
+    def test_ignores_late_results(self, breaker):
+        open_breaker(breaker)
+
+        breaker.record(failed=False, latency=0.01)
+
+        assert breaker.state == OPEN
+
+    def test_lets_probes_through_after_the_open_period(self, breaker, clock):
+        open_breaker(breaker)
+        clock.advance(settings.BREAKER_OPEN_SECONDS)
+
+        breaker.before_call()
+
+        assert breaker.state == HALF_OPEN
+
+
+class TestHalfOpen:
+    @pytest.fixture
+    def half_open(self, breaker, clock) -> CircuitBreaker:
+        open_breaker(breaker)
+        clock.advance(settings.BREAKER_OPEN_SECONDS)
+        return breaker
+
+    def test_limits_concurrent_probes(self, half_open):
+        half_open.before_call()
+        half_open.before_call()
+
+        with pytest.raises(ServiceUnavailableException):
+            half_open.before_call()
+
+    def test_released_probes_free_their_slot(self, half_open):
+        half_open.before_call()
+        half_open.before_call()
+
+        half_open.release()
+
+        half_open.before_call()
+
+    def test_closes_after_enough_successful_probes(self, half_open):
+        record(half_open, ok=2)
+
+        assert half_open.state == CLOSED
+        assert half_open.stats()["calls"] == 0
+
+    def test_reopens_on_a_failed_probe(self, half_open, clock):
+        record(half_open, ok=1, failed=1)
+
+        assert half_open.state == OPEN
+        assert half_open.opened_at == clock.now
+
+    def test_reopens_on_a_slow_probe(self, half_open):
+        record(half_open, ok=1, latency=settings.BREAKER_SLOW_CALL_SECONDS)
+
+        assert half_open.state == OPEN
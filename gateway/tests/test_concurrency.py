@@ -0,0 +1,136 @@
+import pytest
+from core import settings
+from src.utils import concurrency
+from src.utils.concurrency import BULK, CRITICAL, NORMAL, AdaptiveLimiter
+
+from .conftest import Clock
+
+KEY = "users:normal"
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock(1000.0)
+    monkeypatch.setattr(concurrency, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def limiter(monkeypatch, clock) -> AdaptiveLimiter:
+    monkeypatch.setattr(settings, "CONCURRENCY_INITIAL_LIMIT", 10)
+    monkeypatch.setattr(settings, "CONCURRENCY_MIN_LIMIT", 2)
+    return AdaptiveLimiter()
+
+
+def fill(limiter: AdaptiveLimiter, count: int, priority: str = CRITICAL):
+    for _ in range(count):
+        assert limiter.try_acquire(priority)
+
+
+class TestAdmission:
+    def test_lower_priorities_are_shed_first(self, limiter):
+        fill(limiter, 6, BULK)
+
+        assert not limiter.try_acquire(BULK)
+        fill(limiter, 3, NORMAL)
+        assert not limiter.try_acquire(NORMAL)
+        fill(limiter, 1, CRITICAL)
+        assert not limiter.try_acquire(CRITICAL)
+
+        assert limiter.shed == {CRITICAL: 1, NORMAL: 1, BULK: 1}
+
+    def test_release_frees_a_slot(self, limiter):
+        fill(limiter, 10)
+
+        limiter.release(KEY, None, failed=False)
+
+        assert limiter.try_acquire(CRITICAL)
+
+
+class TestAIMD:
+    def test_grows_additively_while_the_limit_is_used(self, limiter):
+        fill(limiter, 10)
+
+        limiter.release(KEY, 0.01, failed=False)
+
+        assert limiter.limit == pytest.approx(10.1)
+
+    def test_does_not_grow_while_mostly_idle(self, limiter):
+        fill(limiter, 1)
+
+        limiter.release(KEY, 0.01, failed=False)
+
+        assert limiter.limit == 10
+
+    def test_slow_calls_shrink_once_per_round_trip(self, limiter, clock):
+        fill(limiter, 3)
+        limiter.release(KEY, 0.01, failed=False)
+
+        limiter.release(KEY, 1.0, failed=False)
+        assert limiter.limit == pytest.approx(9)
+        # Calls sent before the decrease report late, they must not cut again.
+        limiter.release(KEY, 1.0, failed=False)
+        assert limiter.limit == pytest.approx(9)
+
+        clock.advance(1.0)
+        fill(limiter, 1)
+        limiter.release(KEY, 1.0, failed=False)
+        assert limiter.limit == pytest.approx(8.1)
+
+    def test_latency_under_the_floor_is_never_slow(self, limiter):
+        fill(limiter, 2)
+        limiter.release(KEY, 0.001, failed=False)
+
+        limiter.release(KEY, 0.04, failed=False)
+
+        assert limiter.limit == 10
+
+    def test_failures_shrink(self, limiter):
+        fill(limiter, 1)
+
+        limiter.release(KEY, 0.01, failed=True)
+
+        assert limiter.limit == pytest.approx(9)
+
+    def test_never_drops_below_the_minimum(self, limiter, clock):
+        for _ in range(50):
+            clock.advance(1)
+            fill(limiter, 1)
+            limiter.release(KEY, 0.01, failed=True)
+
+        assert limiter.limit == 2
+
+
+class TestBaselines:
+    def test_are_kept_per_service_and_priority(self, limiter):
+        fill(limiter, 2)
+        limiter.release("users:critical", 0.01, failed=False)
+
+        # A slow kind of request sets its own baseline instead of looking
+        # overloaded next to a fast one.
+        limiter.release("users:bulk", 0.5, failed=False)
+
+        assert limiter.limit == 10
+        assert limiter.baselines == {"users:critical": 0.01, "users:bulk": 0.5}
+
+    def test_follow_faster_calls_at_once_and_slower_ones_slowly(
+        self, limiter, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "CONCURRENCY_DRIFT", 0.1)
+        fill(limiter, 3)
+
+        limiter.release(KEY, 0.04, failed=False)
+        limiter.release(KEY, 0.02, failed=False)
+        assert limiter.baselines[KEY] == 0.02
+
+        limiter.release(KEY, 0.03, failed=False)
+        assert limiter.baselines[KEY] == pytest.approx(0.021)
+
+    def test_answers_without_upstream_time_teach_nothing(self, limiter):
+        fill(limiter, 1)
+
+        limiter.release(KEY, None, failed=False)
+
+        assert limiter.in_flight == 0
+        assert limiter.baselines == {}
+        assert limiter.limit == 10
@@ -0,0 +1,176 @@
+import fakeredis
+import pytest
+from exceptions.http_exceptions import TooManyRequestsException
+from src.utils import rate_limit
+from src.utils.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimiter,
+    RateLimitPolicy,
+    RedisRateLimitBackend,
+    sliding_window,
+)
+from starlette.requests import Request
+
+from .conftest import Clock
+
+pytestmark = pytest.mark.anyio
+
+# Start of a minute and of an hour, so elapsed shares are easy to read.
+START = 3600.0 * 1000
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock(START)
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def redis_backend(server) -> RedisRateLimitBackend:
+    return RedisRateLimitBackend(client=fakeredis.FakeAsyncRedis(server=server))
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request, server):
+    if request.param == "memory":
+        return MemoryRateLimitBackend()
+    return redis_backend(server)
+
+
+class TestSlidingWindow:
+    def test_allows_up_to_the_limit(self):
+        assert sliding_window(10, 0, 10, 60, START) == (True, 0)
+
+    def test_full_window_waits_for_its_end(self):
+        assert sliding_window(11, 0, 10, 60, START) == (False, 60)
+        assert sliding_window(11, 0, 10, 60, START + 45) == (False, 15)
+
+    def test_previous_window_is_weighted_by_what_is_left_of_it(self):
+        # Half of the previous 10 plus 5 current is exactly the limit.
+        assert sliding_window(5, 10, 10, 60, START + 30) == (True, 0)
+
+    def test_waits_until_the_previous_window_drained_enough(self):
+        # 6 current leave room for 4 of the previous 10, so 40% of the
+        # window must remain: 24s from now at 30s in is 60 - 30 - 24 = 6s.
+        assert sliding_window(6, 10, 10, 60, START + 30) == (False, 6)
+
+    def test_wait_is_at_least_one_second(self):
+        assert sliding_window(11, 0, 10, 60, START + 59.9) == (False, 1)
+
+
+class TestBackends:
+    async def test_rejects_above_the_limit(self, backend, clock):
+        results = [await backend.hit("k", 3, 60) for _ in range(5)]
+
+        assert [allowed for allowed, _ in results] == [True] * 3 + [False] * 2
+        assert results[-1] == (False, 60)
+
+    async def test_rejected_requests_are_not_counted(self, backend, clock):
+        for _ in range(3):
+            await backend.hit("k", 3, 60)
+        for _ in range(20):
+            assert not (await backend.hit("k", 3, 60))[0]
+
+        # Only the 3 allowed requests weigh on the next window: one more
+        # fits once a third of it has passed, 20s in.
+        clock.advance(60)
+        allowed, retry_after = await backend.hit("k", 3, 60)
+        assert (allowed, retry_after) == (False, 20)
+
+        clock.advance(retry_after)
+        assert await backend.hit("k", 3, 60) == (True, 0)
+
+    async def test_counts_reset_after_two_windows(self, backend, clock):
+        for _ in range(3):
+            await backend.hit("k", 3, 60)
+
+        clock.advance(120)
+        assert [(await backend.hit("k", 3, 60))[0] for _ in range(4)] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+
+    async def test_keys_are_counted_apart(self, backend, clock):
+        for _ in range(3):
+            await backend.hit("a", 3, 60)
+
+        assert not (await backend.hit("a", 3, 60))[0]
+        assert (await backend.hit("b", 3, 60))[0]
+
+    async def test_backends_agree(self, server, clock):
+        memory, redis = MemoryRateLimitBackend(), redis_backend(server)
+        steps = [0, 0, 7, 13, 20, 41, 59, 60, 61, 75, 90, 100, 119, 121, 150]
+
+        for step in steps:
+            clock.now = START + step
+            for key in ("a", "b"):
+                assert await memory.hit(key, 4, 60) == await redis.hit(key, 4, 60)
+
+
+class TestSharedCounting:
+    async def test_redis_workers_share_counters(self, server, clock):
+        workers = [redis_backend(server), redis_backend(server)]
+
+        results = [await workers[n % 2].hit("k", 4, 60) for n in range(6)]
+
+        assert [allowed for allowed, _ in results] == [True] * 4 + [False] * 2
+
+    async def test_memory_longer_windows_survive_shorter_purges(self, clock):
+        backend = MemoryRateLimitBackend()
+        for _ in range(3):
+            await backend.hit("hour", 3, 3600)
+
+        # Purges of the per-minute counters leave the hourly ones alone.
+        for _ in range(5):
+            clock.advance(61)
+            await backend.hit("minute", 100, 60)
+
+        assert not (await backend.hit("hour", 3, 3600))[0]
+
+
+def make_request(user_id: str | None = None) -> Request:
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/users/me",
+            "headers": [],
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+    request.state.user_id = user_id
+    return request
+
+
+class TestRateLimiter:
+    POLICY = RateLimitPolicy(
+        name="me", pattern=rate_limit.re.compile("me"), limit=2, window=60, key="user"
+    )
+
+    async def test_raises_with_retry_after(self, clock):
+        limiter = RateLimiter(backend=MemoryRateLimitBackend())
+        request = make_request("u1")
+
+        for _ in range(2):
+            await limiter.check(request, "users", "me", [self.POLICY])
+        with pytest.raises(TooManyRequestsException) as exc:
+            await limiter.check(request, "users", "me", [self.POLICY])
+
+        assert exc.value.headers["Retry-After"] == "60"
+        assert limiter.rejected == 1
+
+    async def test_user_policies_key_on_the_user_then_the_ip(self, clock):
+        limiter = RateLimiter(backend=MemoryRateLimitBackend())
+
+        for _ in range(2):
+            await limiter.check(make_request("u1"), "users", "me", [self.POLICY])
+        # Another user and an anonymous client from the same IP still pass.
+        await limiter.check(make_request("u2"), "users", "me", [self.POLICY])
+        await limiter.check(make_request(), "users", "me", [self.POLICY])
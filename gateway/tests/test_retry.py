@@ -0,0 +1,205 @@
+import asyncio
+
+import httpx
+import pytest
+from core import settings
+from src.utils import retry
+from src.utils.retry import LatencyTracker, RetryBudget, RetryPolicy
+
+from .conftest import Clock
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock(1000.0)
+    monkeypatch.setattr(retry, "time", clock)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(retry, "backoff", lambda retry: 0)
+
+
+class Upstream:
+    """Answers with the given statuses in turn and then keeps the last one,
+    None stands for a transport error.
+    """
+
+    def __init__(self, *statuses: int | None, delays: dict[str, float] = None):
+        self.statuses = list(statuses)
+        self.delays = delays or {}
+        self.calls: list[str] = []
+
+    async def attempt(self, endpoint: str) -> httpx.Response | None:
+        self.calls.append(endpoint)
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        await asyncio.sleep(self.delays.get(endpoint, 0))
+        return None if status is None else httpx.Response(status)
+
+
+def pick(exclude: str | None) -> str:
+    return "b" if exclude == "a" else "a"
+
+
+class TestRetryBudget:
+    def test_spends_the_burst_then_refuses(self, clock):
+        budget = RetryBudget()
+
+        spent = [budget.withdraw() for _ in range(int(settings.RETRY_BUDGET_BURST))]
+
+        assert all(spent)
+        assert not budget.withdraw()
+
+    def test_refills_over_time(self, clock):
+        budget = RetryBudget()
+        budget.balance = 0
+
+        clock.advance(1 / settings.RETRY_BUDGET_MIN_PER_SECOND)
+
+        assert budget.withdraw()
+        assert not budget.withdraw()
+
+    def test_requests_earn_a_share_of_a_retry(self, clock, monkeypatch):
+        monkeypatch.setattr(settings, "RETRY_BUDGET_RATIO", 0.25)
+        budget = RetryBudget()
+        budget.balance = 0
+
+        for _ in range(4):
+            budget.deposit()
+
+        assert budget.withdraw()
+        assert not budget.withdraw()
+
+
+class TestRun:
+    async def test_retries_on_another_endpoint(self, clock):
+        upstream = Upstream(None, 200)
+
+        endpoint, response = await RetryPolicy().run(
+            "users", "PUT", pick, upstream.attempt
+        )
+
+        assert upstream.calls == ["a", "b"]
+        assert (endpoint, response.status_code) == ("b", 200)
+
+    async def test_stops_after_the_last_attempt(self, clock):
+        upstream = Upstream(503)
+
+        _, response = await RetryPolicy().run("users", "PUT", pick, upstream.attempt)
+
+        assert len(upstream.calls) == settings.RETRY_MAX_ATTEMPTS
+        assert response.status_code == 503
+
+    async def test_does_not_retry_other_errors(self, clock):
+        upstream = Upstream(500)
+
+        _, response = await RetryPolicy().run("users", "PUT", pick, upstream.attempt)
+
+        assert upstream.calls == ["a"]
+        assert response.status_code == 500
+
+    async def test_stops_when_the_budget_is_spent(self, clock):
+        policy = RetryPolicy()
+        policy.budget("users").balance = 0
+        upstream = Upstream(503)
+
+        await policy.run("users", "PUT", pick, upstream.attempt)
+
+        assert upstream.calls == ["a"]
+
+    async def test_makes_one_attempt_without_retries(self, clock, monkeypatch):
+        monkeypatch.setattr(settings, "RETRY_MAX_ATTEMPTS", 0)
+        upstream = Upstream(503)
+
+        endpoint, response = await RetryPolicy().run(
+            "users", "PUT", pick, upstream.attempt
+        )
+
+        assert upstream.calls == ["a"]
+        assert (endpoint, response.status_code) == ("a", 503)
+
+
+class TestLatencyTracker:
+    def test_no_delay_before_enough_samples(self, monkeypatch):
+        monkeypatch.setattr(settings, "HEDGE_MIN_SAMPLES", 10)
+        tracker = LatencyTracker()
+
+        for _ in range(9):
+            tracker.observe(0.1)
+
+        assert tracker.hedge_delay() is None
+
+    def test_delay_is_the_configured_percentile(self, monkeypatch):
+        monkeypatch.setattr(settings, "HEDGE_MIN_SAMPLES", 10)
+        monkeypatch.setattr(settings, "HEDGE_PERCENTILE", 0.9)
+        tracker = LatencyTracker()
+
+        for sample in range(1, 101):
+            tracker.observe(sample / 100)
+
+        assert tracker.hedge_delay() == 0.91
+
+    def test_delay_has_a_floor(self, monkeypatch):
+        monkeypatch.setattr(settings, "HEDGE_MIN_SAMPLES", 1)
+        monkeypatch.setattr(settings, "HEDGE_MIN_DELAY", 0.05)
+        tracker = LatencyTracker()
+
+        tracker.observe(0.001)
+
+        assert tracker.hedge_delay() == 0.05
+
+
+class TestHedging:
+    @pytest.fixture
+    def policy(self, monkeypatch, clock) -> RetryPolicy:
+        monkeypatch.setattr(settings, "HEDGE_ENABLED", True)
+        monkeypatch.setattr(settings, "HEDGE_MIN_SAMPLES", 1)
+        monkeypatch.setattr(settings, "HEDGE_MIN_DELAY", 0.01)
+        policy = RetryPolicy()
+        policy.observe("users", 0.01)
+        return policy
+
+    async def test_slow_call_is_hedged_on_another_endpoint(self, policy):
+        upstream = Upstream(200, delays={"a": 10})
+
+        endpoint, response = await policy.run("users", "GET", pick, upstream.attempt)
+
+        assert upstream.calls == ["a", "b"]
+        assert (endpoint, response.status_code) == ("b", 200)
+
+    async def test_fast_call_is_not_hedged(self, policy):
+        upstream = Upstream(200)
+
+        endpoint, _ = await policy.run("users", "GET", pick, upstream.attempt)
+
+        assert upstream.calls == ["a"]
+        assert endpoint == "a"
+
+    async def test_only_reads_are_hedged(self, policy):
+        upstream = Upstream(200, delays={"a": 0.05})
+
+        endpoint, _ = await policy.run("users", "PUT", pick, upstream.attempt)
+
+        assert upstream.calls == ["a"]
+        assert endpoint == "a"
+
+    async def test_hedges_draw_on_the_retry_budget(self, policy):
+        policy.budget("users").balance = 0
+        upstream = Upstream(200, delays={"a": 0.05})
+
+        endpoint, _ = await policy.run("users", "GET", pick, upstream.attempt)
+
+        assert upstream.calls == ["a"]
+        assert endpoint == "a"
+
+    async def test_waits_for_the_other_call_when_one_fails(self, policy):
+        # The hedge answers first, with an error.
+        upstream = Upstream(200, 503, delays={"a": 0.05})
+
+        endpoint, response = await policy.run("users", "GET", pick, upstream.attempt)
+
+        assert upstream.calls == ["a", "b"]
+        assert (endpoint, response.status_code) == ("a", 200)
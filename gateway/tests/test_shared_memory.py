@@ -0,0 +1,179 @@
+import fcntl
+import multiprocessing
+import os
+from contextlib import contextmanager
+
+import pytest
+from src.utils import shared_memory
+from src.utils.shared_memory import SEQ, SLOT, WAYS, SharedHashTable, digest
+
+from .conftest import Clock
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock(1000.0)
+    monkeypatch.setattr(shared_memory, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def table(tmp_path, clock):
+    # A single bucket, so every key competes for the same slots.
+    table = SharedHashTable("test", slots=WAYS, value_size=32, directory=tmp_path)
+    yield table
+    table.close()
+
+
+def slot_offset(table: SharedHashTable, key: str) -> int:
+    key_digest = digest(key)
+    for slot in range(table.slots):
+        offset = table._offset(slot)
+        if SLOT.unpack_from(table._map, offset)[1] == key_digest:
+            return offset
+    raise KeyError(key)
+
+
+def seq(table: SharedHashTable, offset: int) -> int:
+    return SEQ.unpack_from(table._map, offset)[0]
+
+
+def hold_lock(path: str, offset: int, locked, release):
+    fd = os.open(path, os.O_RDWR)
+    fcntl.lockf(fd, fcntl.LOCK_EX, 1, offset)
+    locked.set()
+    release.wait(10)
+
+
+@contextmanager
+def stripe_held(table: SharedHashTable):
+    """Holds the stripe lock of the only bucket from another process, fcntl
+    locks never stop the process that owns them."""
+
+    context = multiprocessing.get_context("fork")
+    locked, release = context.Event(), context.Event()
+    holder = context.Process(
+        target=hold_lock, args=(table.path, table._stripe(0), locked, release)
+    )
+    holder.start()
+    try:
+        assert locked.wait(10)
+        yield
+    finally:
+        release.set()
+        holder.join(10)
+
+
+class TestTable:
+    def test_set_then_get(self, table):
+        assert table.set("a", b"value", ttl=10)
+
+        assert table.get("a") == b"value"
+        assert table.get("b") is None
+
+    def test_overwrites_in_place(self, table):
+        table.set("a", b"first", ttl=10)
+        table.set("a", b"second", ttl=10)
+
+        assert table.get("a") == b"second"
+        assert len(table) == 1
+
+    def test_entries_expire(self, table, clock):
+        table.set("a", b"value", ttl=10)
+
+        clock.advance(10)
+
+        assert table.get("a") is None
+        assert len(table) == 0
+
+    def test_refuses_values_that_do_not_fit(self, table):
+        assert not table.set("a", b"x" * 33, ttl=10)
+        assert not table.set("a", b"x", ttl=0)
+
+    def test_full_bucket_evicts_the_entry_closest_to_expiry(self, table):
+        for n, ttl in enumerate([30, 10, 40, 20]):
+            table.set(f"k{n}", b"v", ttl=ttl)
+
+        table.set("new", b"v", ttl=50)
+
+        assert table.get("k1") is None
+        assert all(table.get(key) for key in ("k0", "k2", "k3", "new"))
+
+    def test_expired_entries_are_replaced_first(self, table, clock):
+        table.set("old", b"v", ttl=1)
+        clock.advance(2)
+        for n in range(WAYS - 1):
+            table.set(f"k{n}", b"v", ttl=5)
+
+        table.set("new", b"v", ttl=50)
+
+        assert all(table.get(f"k{n}") for n in range(WAYS - 1))
+        assert table.get("new") == b"v"
+
+    def test_delete(self, table):
+        table.set("a", b"value", ttl=10)
+
+        assert table.delete("a", "missing") == []
+
+        assert table.get("a") is None
+
+    def test_workers_share_the_file(self, table, tmp_path):
+        other = SharedHashTable("test", slots=WAYS, value_size=32, directory=tmp_path)
+        try:
+            table.set("a", b"value", ttl=10)
+
+            assert other.get("a") == b"value"
+        finally:
+            other.close()
+
+    def test_rejects_a_file_with_another_layout(self, table, tmp_path):
+        with pytest.raises(RuntimeError):
+            SharedHashTable("test", slots=WAYS * 2, value_size=32, directory=tmp_path)
+
+
+class TestSeqlock:
+    def test_writes_leave_an_even_sequence(self, table):
+        table.set("a", b"first", ttl=10)
+        offset = slot_offset(table, "a")
+        before = seq(table, offset)
+
+        table.set("a", b"second", ttl=10)
+
+        assert before % 2 == 0
+        assert seq(table, offset) == before + 2
+
+    def test_reads_miss_while_a_write_is_in_progress(self, table):
+        table.set("a", b"value", ttl=10)
+        offset = slot_offset(table, "a")
+
+        SEQ.pack_into(table._map, offset, seq(table, offset) + 1)
+
+        assert table.get("a") is None
+
+    def test_a_writer_that_died_midway_does_not_flip_the_parity(self, table):
+        table.set("a", b"value", ttl=10)
+        offset = slot_offset(table, "a")
+        SEQ.pack_into(table._map, offset, seq(table, offset) + 1)
+
+        table.set("a", b"again", ttl=10)
+
+        assert seq(table, offset) % 2 == 0
+        assert table.get("a") == b"again"
+
+
+class TestStripeLocks:
+    def test_set_skips_a_busy_stripe(self, table):
+        with stripe_held(table):
+            assert not table.set("a", b"value", ttl=10)
+
+        assert table.get("a") is None
+
+    def test_delete_returns_the_keys_of_busy_stripes(self, table):
+        table.set("a", b"value", ttl=10)
+
+        with stripe_held(table):
+            assert table.delete("a") == ["a"]
+            assert table.get("a") == b"value"
+
+        assert table.delete("a") == []
+        assert table.get("a") is None
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from src.utils.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+class Call:
+    """Counts calls and answers once released."""
+
+    def __init__(self, result="value"):
+        self.result = result
+        self.calls = 0
+        self.released = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.released.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+async def test_concurrent_callers_share_one_call():
+    flight, call = SingleFlight(), Call()
+
+    callers = [asyncio.ensure_future(flight.do("k", call)) for _ in range(5)]
+    await asyncio.sleep(0)
+    call.released.set()
+
+    assert await asyncio.gather(*callers) == ["value"] * 5
+    assert call.calls == 1
+    assert (flight.leaders, flight.followers) == (1, 4)
+
+
+async def test_keys_are_called_apart():
+    flight, call = SingleFlight(), Call()
+    call.released.set()
+
+    await asyncio.gather(flight.do("a", call), flight.do("b", call))
+
+    assert call.calls == 2
+
+
+async def test_finished_calls_are_not_reused():
+    flight, call = SingleFlight(), Call()
+    call.released.set()
+
+    await flight.do("k", call)
+    await flight.do("k", call)
+
+    assert call.calls == 2
+    assert flight.stats()["in_flight"] == 0
+
+
+async def test_errors_reach_every_caller_and_are_forgotten():
+    flight, call = SingleFlight(), Call(result=ValueError("boom"))
+
+    callers = [asyncio.ensure_future(flight.do("k", call)) for _ in range(2)]
+    await asyncio.sleep(0)
+    call.released.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert flight.stats()["in_flight"] == 0
+
+
+async def test_a_caller_leaving_does_not_cancel_the_call():
+    flight, call = SingleFlight(), Call()
+
+    leader = asyncio.ensure_future(flight.do("k", call))
+    follower = asyncio.ensure_future(flight.do("k", call))
+    await asyncio.sleep(0)
+    leader.cancel()
+    call.released.set()
+
+    assert await follower == "value"
+    assert leader.cancelled()
+    assert call.calls == 1
@@ -0,0 +1,24 @@
+from .exporters import FileExporter, InMemoryExporter, NoopExporter, build_exporter
+from .middleware import TracingMiddleware
+from .tracer import (
+    TRACEPARENT,
+    Span,
+    SpanContext,
+    Tracer,
+    current_span,
+    parse_traceparent,
+)
+
+__all__ = [
+    "FileExporter",
+    "InMemoryExporter",
+    "NoopExporter",
+    "build_exporter",
+    "TracingMiddleware",
+    "TRACEPARENT",
+    "Span",
+    "SpanContext",
+    "Tracer",
+    "current_span",
+    "parse_traceparent",
+]
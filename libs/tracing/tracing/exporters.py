@@ -0,0 +1,111 @@
+import atexit
+import importlib
+import json
+import os
+import queue
+import threading
+from collections import deque
+
+from .tracer import Span
+
+
+class NoopExporter:
+    def export(self, span: Span):
+        pass
+
+
+class InMemoryExporter:
+    def __init__(self, max_spans: int = 10000):
+        self.spans: deque[dict] = deque(maxlen=max_spans)
+
+    def export(self, span: Span):
+        self.spans.append(span.to_dict())
+
+    def clear(self):
+        self.spans.clear()
+
+
+class FileExporter:
+    """Appends one JSON line per span from a writer thread.
+
+    export() runs on the event loop and only queues the span; the thread
+    writes everything queued since its last write with one open and write.
+    Spans are dropped, and counted, while the queue is full.
+    """
+
+    def __init__(self, path: str, max_queue: int = 10000):
+        self.path = path
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._queue: queue.Queue[dict | None] | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        # Forked workers inherit the exporter but not its thread.
+        if self._pid != os.getpid():
+            self._start()
+
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0):
+        if self._thread is None or self._pid != os.getpid():
+            return
+
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+        self._pid = None
+
+    def _start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._thread = threading.Thread(
+                target=self._run, name="trace-file-exporter", daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+            atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            lines = []
+            while record is not None:
+                lines.append(json.dumps(record, default=str))
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if lines:
+                with open(self.path, "a") as file:
+                    file.write("\n".join(lines) + "\n")
+
+            if record is None:
+                return
+
+
+def build_exporter(kind: str, path: str = "traces.jsonl"):
+    """Exporter for TRACE_EXPORTER: none | memory | file | module:Class."""
+
+    if kind in ("", "none"):
+        return NoopExporter()
+    if kind == "memory":
+        return InMemoryExporter()
+    if kind == "file":
+        return FileExporter(path)
+
+    # Anything else is a "module:Class" path to a custom exporter.
+    module, _, name = kind.partition(":")
+    return getattr(importlib.import_module(module), name)()
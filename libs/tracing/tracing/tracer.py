@@ -0,0 +1,118 @@
+import os
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+TRACEPARENT = "traceparent"
+TRACEPARENT_PATTERN = re.compile(
+    r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-|$)"
+)
+
+
+@dataclass
+class SpanContext:
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    service: str = ""
+    parent_id: str | None = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    status: str = "ok"
+    attributes: dict = field(default_factory=dict)
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "service": self.service,
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    match = TRACEPARENT_PATTERN.match(value.strip().lower()) if value else None
+    if match is None:
+        return None
+
+    trace_id, span_id, flags, _ = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+
+    return SpanContext(trace_id, span_id, sampled=bool(int(flags, 16) & 1))
+
+
+class Tracer:
+    def __init__(self, exporter, service: str, sample_rate: float = 1.0):
+        self.exporter = exporter
+        self.service = service
+        self.sample_rate = sample_rate
+
+    @contextmanager
+    def span(self, name: str, parent: SpanContext | None = None, **attributes):
+        if parent is None:
+            active = current_span.get()
+            parent = active.context if active is not None else None
+
+        if parent is None:
+            context = SpanContext(
+                trace_id=os.urandom(16).hex(),
+                span_id=os.urandom(8).hex(),
+                sampled=random.random() < self.sample_rate,
+            )
+        else:
+            context = SpanContext(
+                trace_id=parent.trace_id,
+                span_id=os.urandom(8).hex(),
+                sampled=parent.sampled,
+            )
+
+        span = Span(
+            name=name,
+            context=context,
+            service=self.service,
+            parent_id=parent.span_id if parent is not None else None,
+            attributes=attributes,
+        )
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.status = "error"
+            span.set_attribute("error", type(exc).__name__)
+            raise
+        finally:
+            current_span.reset(token)
+            span.end_ns = time.time_ns()
+            if context.sampled:
+                self.exporter.export(span)
+
+    def inject(self, headers: dict) -> dict:
+        span = current_span.get()
+        if span is not None:
+            headers[TRACEPARENT] = span.context.traceparent
+        return headers
@@ -1,8 +1,11 @@
 __all__ = [
     "settings",
     "celery_app",
+    "FastJSONResponse",
+    "FastJSONRoute",
 ]
 
 from . import celeryconfig
 from .celery_app import celery_app
 from .config import settings
+from .fast_json import FastJSONResponse, FastJSONRoute
@@ -21,6 +21,12 @@ class Settings(BaseSettings):
     SMTP_USER: str = os.getenv("SMTP_USER")
     SMTP_PASS: str = os.getenv("SMTP_PASS")
 
+    # Tracing, TRACE_EXPORTER: none | memory | file | module:Class
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "none")
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "traces.jsonl")
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", 1.0))
+    TRACE_SERVICE_NAME: str = os.getenv("TRACE_SERVICE_NAME", "background")
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,36 @@
+import json
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic_core import from_json, to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core instead of the json module."""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class FastJSONRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            try:
+                self._json = from_json(body)
+            except ValueError as exc:
+                # FastAPI turns JSONDecodeError into a 422 json_invalid error.
+                raise json.JSONDecodeError(str(exc), body.decode(errors="replace"), 0)
+        return self._json
+
+
+class FastJSONRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(FastJSONRequest(request.scope, request.receive))
+
+        return route_handler
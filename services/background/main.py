@@ -1,9 +1,13 @@
+from core import FastJSONResponse
 from fastapi import FastAPI
 from src.routes import notific_router
+from src.utils import TracingMiddleware, tracer
 
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    app.add_middleware(TracingMiddleware, tracer=tracer)
 
     app.include_router(notific_router)
 
@@ -1,12 +1,15 @@
+from core import FastJSONRoute
 from fastapi import APIRouter
 from pydantic import EmailStr
 from src.schemas.email_model import EmailSendData
 from src.tasks import send_email_task
+from src.utils import tracer
 from starlette import status
 
 router = APIRouter(
     prefix="/notification",
     tags=["Notification"],
+    route_class=FastJSONRoute,
 )
 
 
@@ -19,4 +22,9 @@ async def send_mail(data: EmailSendData):
     subject: str = data.subject
     body: str = data.body
 
-    send_email_task.delay(email=to, subject=subject, body=body)
+    # The trace context rides along in the message headers.
+    with tracer.span("celery.enqueue", task=send_email_task.name):
+        send_email_task.apply_async(
+            kwargs={"email": to, "subject": subject, "body": body},
+            headers=tracer.inject({}),
+        )
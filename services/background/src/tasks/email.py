@@ -1,7 +1,10 @@
 from celery import shared_task
-from src.utils import send_email
+from src.utils import TRACEPARENT, parse_traceparent, send_email, tracer
 
 
-@shared_task(name="src.tasks.email.send_email_task")
-def send_email_task(email: str, subject: str, body: str):
-    send_email(to=email, subject=subject, body=body)
+@shared_task(bind=True, name="src.tasks.email.send_email_task")
+def send_email_task(self, email: str, subject: str, body: str):
+    parent = parse_traceparent(getattr(self.request, TRACEPARENT, None))
+
+    with tracer.span("celery.task", parent=parent, task=self.name):
+        send_email(to=email, subject=subject, body=body)
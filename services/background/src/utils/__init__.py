@@ -1,5 +1,10 @@
 from .mailer import send_email
+from .tracing import TRACEPARENT, TracingMiddleware, parse_traceparent, tracer
 
 __all__ = [
     "send_email",
+    "TRACEPARENT",
+    "TracingMiddleware",
+    "parse_traceparent",
+    "tracer",
 ]
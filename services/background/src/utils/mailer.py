@@ -3,6 +3,8 @@ from email.message import EmailMessage
 
 from core import settings
 
+from .tracing import tracer
+
 
 def send_email(to: str, subject: str, body: str):
     msg = EmailMessage()
@@ -15,7 +17,8 @@ def send_email(to: str, subject: str, body: str):
     smtp_user = settings.SMTP_USER
     smtp_pass = settings.SMTP_PASS
 
-    with smtplib.SMTP(smtp_host, smtp_port) as server:
-        server.starttls()
-        server.login(smtp_user, smtp_pass)
-        server.send_message(msg)
+    with tracer.span("smtp.send", host=smtp_host):
+        with smtplib.SMTP(smtp_host, smtp_port) as server:
+            server.starttls()
+            server.login(smtp_user, smtp_pass)
+            server.send_message(msg)
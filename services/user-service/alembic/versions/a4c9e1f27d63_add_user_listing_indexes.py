@@ -0,0 +1,40 @@
+"""Add user listing indexes
+
+Revision ID: a4c9e1f27d63
+Revises: 8f3a1c2d9b47
+Create Date: 2026-10-18 15:12:40.275118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c9e1f27d63"
+down_revision: Union[str, Sequence[str], None] = "8f3a1c2d9b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_users_created_at_id",
+        "users",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_users_profession_created_at_id",
+        "users",
+        ["profession", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_profession_created_at_id", table_name="users")
+    op.drop_index("ix_users_created_at_id", table_name="users")
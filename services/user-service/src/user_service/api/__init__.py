@@ -1,5 +1,6 @@
 __all__ = [
+    "metrics",
     "v1",
 ]
 
-from . import v1
+from . import metrics, v1
@@ -1,7 +1,10 @@
 __all__ = [
+    "admin_dependency",
     "db_dependency",
+    "primary_db_dependency",
     "user_id_dependency",
 ]
 
-from .db import db_dependency
+from .admin import admin_dependency
+from .db import db_dependency, primary_db_dependency
 from .users import user_id_dependency
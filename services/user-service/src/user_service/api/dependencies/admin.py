@@ -0,0 +1,20 @@
+import hmac
+
+from fastapi import Depends, Request
+from user_service.core import settings
+from user_service.exceptions.http_exceptions import AdminAuthException
+
+ADMIN_KEY_HEADER = "x-admin-key"
+
+
+def check_admin_key(request: Request):
+    key = request.headers.get(ADMIN_KEY_HEADER)
+
+    if not settings.ADMIN_API_KEY or key is None:
+        raise AdminAuthException()
+
+    if not hmac.compare_digest(key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise AdminAuthException(detail="Invalid admin API key")
+
+
+admin_dependency = Depends(check_admin_key)
@@ -1,4 +1,6 @@
 from fastapi import Depends
-from user_service.db import get_async_session
+from user_service.db import get_async_session, get_primary_session
 
 db_dependency = Depends(get_async_session)
+# Writes and read-your-writes flows, never served by a replica.
+primary_db_dependency = Depends(get_primary_session)
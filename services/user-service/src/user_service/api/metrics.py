@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Response
+from user_service.db.pool import pool_stats
+from user_service.db.routing import replicas
+from user_service.db.session import engine
+
+router = APIRouter(
+    tags=["metrics"],
+)
+
+# Prometheus text exposition of the pool, name -> (type, stats key, help).
+POOL_METRICS = {
+    "user_service_db_pool_size": ("gauge", "size", "Configured pool size"),
+    "user_service_db_pool_checked_out": (
+        "gauge",
+        "checked_out",
+        "Connections in use",
+    ),
+    "user_service_db_pool_checked_in": (
+        "gauge",
+        "checked_in",
+        "Idle connections in the pool",
+    ),
+    "user_service_db_pool_overflow": (
+        "gauge",
+        "overflow",
+        "Connections opened beyond the pool size",
+    ),
+    "user_service_db_pool_checkouts_total": (
+        "counter",
+        "waits",
+        "Connection checkouts",
+    ),
+    "user_service_db_pool_wait_seconds_total": (
+        "counter",
+        "wait_seconds",
+        "Time spent waiting for a connection",
+    ),
+    "user_service_db_pool_wait_seconds_max": (
+        "gauge",
+        "max_wait_seconds",
+        "Longest wait for a connection",
+    ),
+    "user_service_db_pool_timeouts_total": (
+        "counter",
+        "timeouts",
+        "Checkouts that hit DB_POOL_TIMEOUT",
+    ),
+}
+
+
+def render(pools: dict) -> str:
+    lines = []
+    for name, (kind, key, description) in POOL_METRICS.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for pool, stats in pools.items():
+            if key in stats:
+                lines.append(f'{name}{{pool="{pool}"}} {stats[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def render_replicas(stats: dict) -> str:
+    lines = [
+        "# HELP user_service_db_replica_healthy Replica serves reads",
+        "# TYPE user_service_db_replica_healthy gauge",
+    ]
+    for name, replica in stats.items():
+        lines.append(
+            f'user_service_db_replica_healthy{{replica="{name}"}} '
+            f"{int(replica['healthy'])}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    replica_stats = replicas.stats()
+    pools = {
+        "primary": pool_stats(engine),
+        **{name: replica["pool"] for name, replica in replica_stats.items()},
+    }
+    return Response(
+        content=render(pools) + render_replicas(replica_stats),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@router.get("/_service/pool", include_in_schema=False)
+async def get_pool():
+    return {"primary": pool_stats(engine), "replicas": replicas.stats()}
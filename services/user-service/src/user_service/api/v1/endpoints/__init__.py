@@ -1,7 +1,9 @@
 __all__ = [
+    "admin_router",
     "auth_router",
     "users_router",
 ]
 
+from .admin import router as admin_router
 from .auth import router as auth_router
 from .users import router as users_router
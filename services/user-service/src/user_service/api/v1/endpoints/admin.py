@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+from user_service.api.dependencies import admin_dependency
+from user_service.ctrls import admin as admin_ctrls
+from user_service.db.routing import PRIMARY
+from user_service.db.session import AsyncSessionMaker
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """Streams while the request body is still being read.
+
+    Below ASGI 2.4 Starlette watches receive() for a disconnect while it
+    streams, which would swallow the body chunks the generator is reading.
+    A dropped client still surfaces as ClientDisconnect from the body stream.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[admin_dependency],
+)
+
+
+@router.post(
+    path="/users/import",
+    response_class=UploadStreamingResponse,
+)
+async def import_users(
+    request: Request,
+    verified: bool = False,
+):
+    """Internal, the gateway does not forward it; call the user-service directly.
+
+    Results stream back while the upload is still being read. The gateway's
+    HTTP client sends the whole body before reading the response, so the
+    results would back up until the upload stalls.
+    """
+
+    data = {
+        "stream": request.stream(),
+        "format": admin_ctrls.import_format(request.headers.get("content-type")),
+        "verified": verified,
+    }
+
+    async def results():
+        # The session has to outlive the endpoint, so it is not a dependency.
+        async with AsyncSessionMaker(info={PRIMARY: True}) as db:
+            async for line in admin_ctrls.import_users(data=data, db=db):
+                yield line
+
+    return UploadStreamingResponse(results(), media_type=admin_ctrls.NDJSON)
@@ -1,11 +1,17 @@
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
-from user_service.api.dependencies import db_dependency, user_id_dependency
+from user_service.api.dependencies import (
+    admin_dependency,
+    primary_db_dependency,
+    user_id_dependency,
+)
+from user_service.core import FastJSONRoute
 from user_service.ctrls import auth as auth_ctrls
 from user_service.schemas import MessageResponse
 from user_service.schemas import auth as auth_schemas
@@ -14,6 +20,7 @@ from user_service.schemas import users as users_schemas
 router = APIRouter(
     prefix="/auth",
     tags=["auth"],
+    route_class=FastJSONRoute,
 )
 
 
@@ -24,7 +31,7 @@ router = APIRouter(
 )
 async def register(
     data: users_schemas.UserRegister,
-    db: AsyncSession = db_dependency,
+    db: AsyncSession = primary_db_dependency,
 ):
     data = data.model_dump()
 
@@ -43,7 +50,7 @@ async def register(
 )
 async def verify_otp(
     data: auth_schemas.OTPRequest,
-    db: AsyncSession = db_dependency,
+    db: AsyncSession = primary_db_dependency,
 ):
     data = data.model_dump()
 
@@ -61,7 +68,7 @@ async def verify_otp(
 )
 async def send_otp(
     data: auth_schemas.EmailOrUsernameRequest,
-    db: AsyncSession = db_dependency,
+    db: AsyncSession = primary_db_dependency,
 ):
     data = data.model_dump()
 
@@ -81,7 +88,7 @@ async def send_otp(
 )
 async def login(
     data: auth_schemas.LoginRequest,
-    db: AsyncSession = db_dependency,
+    db: AsyncSession = primary_db_dependency,
 ):
     data = data.model_dump()
 
@@ -100,7 +107,7 @@ async def login(
 async def reset_password(
     data: auth_schemas.PasswordResset,
     user_id: UUID = user_id_dependency,
-    db: AsyncSession = db_dependency,
+    db: AsyncSession = primary_db_dependency,
 ):
     data = data.model_dump()
     data["user_id"] = user_id
@@ -119,7 +126,7 @@ async def reset_password(
 )
 async def reset_password_otp(
     data: auth_schemas.PasswordResetOTP,
-    db: AsyncSession = db_dependency,
+    db: AsyncSession = primary_db_dependency,
 ):
     data = data.model_dump()
 
@@ -137,7 +144,7 @@ async def reset_password_otp(
 )
 async def refresh(
     data: auth_schemas.RefreshTokenRequest,
-    db: AsyncSession = db_dependency,
+    db: AsyncSession = primary_db_dependency,
 ):
     data = data.model_dump()
 
@@ -155,7 +162,7 @@ async def refresh(
 )
 async def logout(
     data: auth_schemas.RefreshTokenRequest,
-    db: AsyncSession = db_dependency,
+    db: AsyncSession = primary_db_dependency,
 ):
     data = data.model_dump()
 
@@ -165,3 +172,24 @@ async def logout(
     )
 
     return response
+
+
+@router.get(
+    path="/revoked",
+    response_model=auth_schemas.RevokedTokensResponse,
+    dependencies=[admin_dependency],
+)
+async def get_revoked_tokens(
+    since: Optional[datetime] = None,
+    db: AsyncSession = primary_db_dependency,
+):
+    data = {
+        "since": since,
+    }
+
+    response = await auth_ctrls.get_revoked_tokens(
+        data=data,
+        db=db,
+    )
+
+    return response
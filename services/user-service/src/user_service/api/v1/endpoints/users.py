@@ -1,15 +1,23 @@
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
-from user_service.api.dependencies import db_dependency, user_id_dependency
+from user_service.api.dependencies import (
+    admin_dependency,
+    db_dependency,
+    primary_db_dependency,
+    user_id_dependency,
+)
+from user_service.core import FastJSONRoute, settings
 from user_service.ctrls import users as users_ctrls
 from user_service.schemas import users as users_schemas
 
 router = APIRouter(
     prefix="",
     tags=["Users"],
+    route_class=FastJSONRoute,
 )
 
 
@@ -27,7 +35,8 @@ async def receive_data(
 )
 async def get_user_id(
     request: Request,
-    db: AsyncSession = db_dependency,
+    # A refresh token issued a moment ago may not be on a replica yet.
+    db: AsyncSession = primary_db_dependency,
 ):
     data = {
         "request": request,
@@ -43,6 +52,39 @@ async def get_user_id(
     }
 
 
+@router.get(
+    path="/",
+    response_model=users_schemas.UserShortPage | users_schemas.UserPage,
+    status_code=status.HTTP_200_OK,
+    dependencies=[admin_dependency],
+)
+async def list_users(
+    cursor: str | None = None,
+    limit: int = Query(settings.USERS_PAGE_SIZE, ge=1, le=settings.USERS_PAGE_MAX_SIZE),
+    is_active: bool | None = None,
+    is_verified: bool | None = None,
+    profession: str | None = None,
+    view: Literal["short", "full"] = "short",
+    db: AsyncSession = db_dependency,
+):
+    data = {
+        "cursor": cursor,
+        "limit": limit,
+        "is_active": is_active,
+        "is_verified": is_verified,
+        "profession": profession,
+    }
+
+    page = await users_ctrls.list_users(
+        data=data,
+        db=db,
+    )
+
+    if view == "full":
+        return users_schemas.UserPage.model_validate(page)
+    return users_schemas.UserShortPage.model_validate(page)
+
+
 @router.get(
     path="/{username}",
     response_model=users_schemas.UserResponse,
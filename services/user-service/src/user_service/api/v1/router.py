@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 
-from .endpoints import auth_router, users_router
+from .endpoints import admin_router, auth_router, users_router
 
 router = APIRouter(
     prefix="/v1",
 )
 
+router.include_router(admin_router)
 router.include_router(auth_router)
 router.include_router(users_router)
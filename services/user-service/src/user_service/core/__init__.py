@@ -1,5 +1,8 @@
 __all__ = [
     "settings",
+    "FastJSONResponse",
+    "FastJSONRoute",
 ]
 
 from .config import settings
+from .fast_json import FastJSONResponse, FastJSONRoute
@@ -31,9 +31,52 @@ class Settings(BaseSettings):
 
     USER_SERVICE_POSTGRES_HOST: str = os.getenv("USER_SERVICE_POSTGRES_HOST")
 
+    # Service: DB connection pool, per worker process
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 5.0))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Service: DB read replicas, comma separated host:port list that shares
+    # the credentials and database name of DATABASE_URL
+    DB_REPLICA_HOSTS: str = os.getenv("DB_REPLICA_HOSTS", "")
+    DB_REPLICA_MAX_LAG: float = float(os.getenv("DB_REPLICA_MAX_LAG", 1.0))
+    DB_REPLICA_HEALTH_INTERVAL: float = float(
+        os.getenv("DB_REPLICA_HEALTH_INTERVAL", 5.0)
+    )
+    DB_REPLICA_HEALTH_TIMEOUT: float = float(
+        os.getenv("DB_REPLICA_HEALTH_TIMEOUT", 2.0)
+    )
+
+    # Bulk inserts: rows per statement, batches this large go through COPY
+    DB_BULK_CHUNK_SIZE: int = int(os.getenv("DB_BULK_CHUNK_SIZE", 1000))
+    DB_BULK_COPY_THRESHOLD: int = int(os.getenv("DB_BULK_COPY_THRESHOLD", 10000))
+
+    # User listing page sizes
+    USERS_PAGE_SIZE: int = int(os.getenv("USERS_PAGE_SIZE", 50))
+    USERS_PAGE_MAX_SIZE: int = int(os.getenv("USERS_PAGE_MAX_SIZE", 500))
+
+    # Admin endpoints and the gateway's revocation sync, disabled while
+    # ADMIN_API_KEY is unset
+    ADMIN_API_KEY: str | None = os.getenv("ADMIN_API_KEY")
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", 500))
+    IMPORT_MAX_LINE_BYTES: int = int(os.getenv("IMPORT_MAX_LINE_BYTES", 64 * 1024))
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 4)
+    )
+
+    # Set when DATABASE_URL points at PgBouncer in transaction pooling mode
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
     BACKGROUND_HOST: str = os.getenv("BACKGROUND_HOST")
     BACKGROUND_PORT: str = os.getenv("BACKGROUND_PORT")
 
+    # Tracing, TRACE_EXPORTER: none | memory | file | module:Class
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "none")
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "traces.jsonl")
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", 1.0))
+    TRACE_SERVICE_NAME: str = os.getenv("TRACE_SERVICE_NAME", "user-service")
+
     class Config:
         env_file = "./.env"
         case_sensitive = True
@@ -0,0 +1,80 @@
+import functools
+import inspect
+import json
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from pydantic_core import from_json, to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core instead of the json module."""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class FastJSONRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            try:
+                self._json = from_json(body)
+            except ValueError as exc:
+                # FastAPI turns JSONDecodeError into a 422 json_invalid error.
+                raise json.JSONDecodeError(str(exc), body.decode(errors="replace"), 0)
+        return self._json
+
+
+def serialize_with(endpoint: Callable, response_model: Any, status_code: int | None):
+    """Dump the endpoint result to bytes in one pydantic-core pass.
+
+    FastAPI would validate into a model, convert it to a dict and only then
+    encode it; the returned Response skips all of that.
+    """
+
+    adapter = TypeAdapter(response_model)
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        if isinstance(result, Response):
+            return result
+
+        value = adapter.validate_python(result, from_attributes=True)
+        return Response(
+            content=adapter.dump_json(value, by_alias=True),
+            status_code=status_code or 200,
+            media_type="application/json",
+        )
+
+    wrapper.serialized = True
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        response_model = kwargs.get("response_model")
+        if (
+            response_model is not None
+            and not isinstance(response_model, DefaultPlaceholder)
+            and inspect.iscoroutinefunction(endpoint)
+            and not getattr(endpoint, "serialized", False)
+        ):
+            endpoint = serialize_with(
+                endpoint, response_model, kwargs.get("status_code")
+            )
+
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(FastJSONRequest(request.scope, request.receive))
+
+        return route_handler
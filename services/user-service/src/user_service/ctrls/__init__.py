@@ -1,6 +1,7 @@
 __all__ = [
+    "admin",
     "auth",
     "users",
 ]
 
-from . import auth, users
+from . import admin, auth, users
@@ -0,0 +1,247 @@
+import csv
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from pydantic import ValidationError
+from pydantic_core import from_json, to_json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from user_service.core import settings
+from user_service.db.models import Auth, User
+from user_service.db.services import bulk_insert_into_table, get_data_from_table
+from user_service.exceptions.base import AppException
+from user_service.exceptions.http_exceptions import UnsupportedMediaType
+from user_service.schemas.users import UserRegister
+from user_service.utils import hash_passwords
+
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+IMPORT_FORMATS = {
+    NDJSON: NDJSON,
+    "application/jsonl": NDJSON,
+    "application/json-lines": NDJSON,
+    CSV: CSV,
+}
+
+CREATED = "created"
+ERROR = "error"
+
+Row = Tuple[int, UserRegister]
+
+
+def import_format(content_type: str | None) -> str:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in IMPORT_FORMATS:
+        raise UnsupportedMediaType(
+            detail=f"Expected one of: {', '.join(IMPORT_FORMATS)}",
+        )
+    return IMPORT_FORMATS[media_type]
+
+
+def decode_line(line: bytes) -> str | ValueError:
+    if len(line) > settings.IMPORT_MAX_LINE_BYTES:
+        return ValueError(f"Line exceeds {settings.IMPORT_MAX_LINE_BYTES} bytes")
+    try:
+        return line.decode("utf-8-sig").rstrip("\r")
+    except UnicodeDecodeError:
+        return ValueError("Line is not valid UTF-8")
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str | ValueError]:
+    """Decoded lines, an error in place of a line that cannot be decoded or
+    is longer than IMPORT_MAX_LINE_BYTES. The rest of an overlong line is
+    dropped as it arrives instead of being buffered.
+    """
+
+    buffer = b""
+    skipping = False
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                # Tail of the overlong line already reported below.
+                skipping = False
+                continue
+            yield decode_line(line)
+
+        if len(buffer) > settings.IMPORT_MAX_LINE_BYTES:
+            if not skipping:
+                yield decode_line(buffer)
+                skipping = True
+            buffer = b""
+
+    if buffer and not skipping:
+        yield decode_line(buffer)
+
+
+async def iter_records(
+    lines: AsyncIterator[str | ValueError], format: str
+) -> AsyncIterator[Tuple[int, Any]]:
+    """(line number, parsed record) pairs, an exception in place of a record
+    that cannot be parsed. CSV records must fit on one line and the first
+    line is the header.
+    """
+
+    header = None
+    number = 0
+    async for line in lines:
+        number += 1
+        if isinstance(line, ValueError):
+            yield number, line
+            continue
+        if not line.strip():
+            continue
+
+        if format == CSV:
+            row = next(csv.reader([line]))
+            if header is None:
+                header = [name.strip() for name in row]
+                continue
+            if len(row) != len(header):
+                yield number, ValueError("Column count does not match the header")
+                continue
+            yield number, dict(zip(header, row))
+        else:
+            try:
+                record = from_json(line)
+            except ValueError as exc:
+                yield number, exc
+                continue
+            if not isinstance(record, dict):
+                record = ValueError("Expected a JSON object")
+            yield number, record
+
+
+def result(line: int, status: str, **fields) -> Dict[str, Any]:
+    return {"line": line, "status": status, **fields}
+
+
+async def existing(db: AsyncSession, column, values: List[str]) -> set:
+    found = await get_data_from_table(
+        query=select(column).where(column.in_(values)),
+        session=db,
+        __get_all__=True,
+    )
+    return set(found)
+
+
+async def import_chunk(
+    rows: List[Row], db: AsyncSession, verified: bool
+) -> List[Dict[str, Any]]:
+    results = []
+
+    try:
+        emails = await existing(db, User.email, [user.email for _, user in rows])
+        usernames = await existing(
+            db, User.username, [user.username for _, user in rows]
+        )
+    except AppException as exc:
+        # Reported per row like a failed insert, the stream goes on.
+        return [result(line, ERROR, detail=exc.detail) for line, _ in rows]
+
+    accepted: List[Row] = []
+    for line, user in rows:
+        if user.email in emails:
+            results.append(result(line, ERROR, detail="Email already exists"))
+        elif user.username in usernames:
+            results.append(result(line, ERROR, detail="Username already exists"))
+        else:
+            emails.add(user.email)
+            usernames.add(user.username)
+            accepted.append((line, user))
+
+    if not accepted:
+        return results
+
+    hashed = await hash_passwords([user.password for _, user in accepted])
+    ids = [uuid.uuid4() for _ in accepted]
+
+    try:
+        await bulk_insert_into_table(
+            model_class=User,
+            session=db,
+            rows=[
+                {
+                    "id": user_id,
+                    "email": user.email,
+                    "username": user.username,
+                    "full_name": user.full_name,
+                    "is_verified": verified,
+                }
+                for user_id, (_, user) in zip(ids, accepted)
+            ],
+            copy_threshold=1,
+            auto_commit=False,
+        )
+        await bulk_insert_into_table(
+            model_class=Auth,
+            session=db,
+            rows=[
+                {"user_id": user_id, "hashed_password": hashed_password}
+                for user_id, hashed_password in zip(ids, hashed)
+            ],
+            copy_threshold=1,
+        )
+    except AppException as exc:
+        results.extend(result(line, ERROR, detail=exc.detail) for line, _ in accepted)
+        return results
+
+    results.extend(
+        result(line, CREATED, id=str(user_id))
+        for user_id, (line, _) in zip(ids, accepted)
+    )
+    return results
+
+
+async def import_users(
+    data: Dict[str, Any],
+    db: AsyncSession,
+) -> AsyncIterator[bytes]:
+    """Stream one NDJSON result per input row, then a summary line.
+
+    Rows are validated as they arrive and written a chunk at a time, so
+    memory stays bounded by IMPORT_CHUNK_SIZE whatever the upload size.
+    """
+
+    created = failed = 0
+    chunk: List[Row] = []
+
+    async def flush():
+        nonlocal created, failed
+        for row in await import_chunk(chunk, db, data["verified"]):
+            if row["status"] == CREATED:
+                created += 1
+            else:
+                failed += 1
+            yield to_json(row) + b"\n"
+        chunk.clear()
+
+    records = iter_records(iter_lines(data["stream"]), data["format"])
+    async for line, record in records:
+        if isinstance(record, Exception):
+            failed += 1
+            yield to_json(result(line, ERROR, detail=str(record))) + b"\n"
+            continue
+
+        try:
+            user = UserRegister.model_validate(record)
+        except ValidationError as exc:
+            failed += 1
+            errors = [
+                {"loc": error["loc"], "msg": error["msg"]}
+                for error in exc.errors(include_url=False)
+            ]
+            yield to_json(result(line, ERROR, errors=errors)) + b"\n"
+            continue
+
+        chunk.append((line, user))
+        if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+            async for row in flush():
+                yield row
+
+    if chunk:
+        async for row in flush():
+            yield row
+
+    yield to_json({"created": created, "failed": failed}) + b"\n"
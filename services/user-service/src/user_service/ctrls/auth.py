@@ -283,6 +283,7 @@ async def refresh(
         id=token_db.id,
         schema={
             "revoked": True,
+            "revoked_at": datetime.now(),
         },
         session=db,
     )
@@ -318,6 +319,7 @@ async def logout(
         id=token_db.id,
         schema={
             "revoked": True,
+            "revoked_at": datetime.now(),
         },
         session=db,
     )
@@ -325,6 +327,34 @@ async def logout(
     return {"message": "Successfully logged out"}
 
 
+async def get_revoked_tokens(
+    data: Dict[str, Any],
+    db: AsyncSession,
+):
+    until = datetime.now()
+    since = data.get("since") or until - timedelta(
+        hours=settings.ACCESS_TOKEN_EXPIRE_HOURS,
+    )
+
+    query = (
+        select(RefreshToken)
+        .where(RefreshToken.revoked == True)
+        .where(RefreshToken.revoked_at > since)
+        .where(RefreshToken.revoked_at <= until)
+    )
+
+    tokens = await get_data_from_table(
+        query=query,
+        session=db,
+        __get_all__=True,
+    )
+
+    return {
+        "revoked": [token.id for token in tokens],
+        "until": until,
+    }
+
+
 # --------------------
 
 
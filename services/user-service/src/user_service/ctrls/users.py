@@ -1,13 +1,17 @@
+import base64
+import binascii
+from datetime import datetime
 from typing import Any, Dict
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from pydantic_core import from_json, to_json
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 from user_service.db.models import RefreshToken, User
 from user_service.db.services import get_data_from_table, update_model
-from user_service.exceptions.http_exceptions import CTRLException
+from user_service.exceptions.http_exceptions import CTRLException, ValidationException
 from user_service.utils import decode_token
 
 
@@ -114,3 +118,54 @@ async def update_user(
         )
 
     return user
+
+
+def encode_cursor(user: User) -> str:
+    position = to_json([user.created_at.isoformat(), str(user.id)])
+    return base64.urlsafe_b64encode(position).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = from_json(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (binascii.Error, TypeError, ValueError):
+        raise ValidationException(detail="Invalid cursor")
+
+
+async def list_users(
+    data: Dict[str, Any],
+    db: AsyncSession,
+):
+    """One page of users in (created_at, id) order.
+
+    The cursor is the position of the last user of the previous page, so
+    every page is an index seek instead of an ever growing OFFSET scan.
+    """
+
+    query = select(User)
+    for field in ("is_active", "is_verified", "profession"):
+        if data.get(field) is not None:
+            query = query.where(getattr(User, field) == data[field])
+
+    if data.get("cursor"):
+        query = query.where(
+            tuple_(User.created_at, User.id) > decode_cursor(data["cursor"])
+        )
+
+    limit = data["limit"]
+    query = query.order_by(User.created_at, User.id).limit(limit + 1)
+
+    users = await get_data_from_table(
+        query=query,
+        session=db,
+        __get_all__=True,
+    )
+
+    next_cursor = encode_cursor(users[limit - 1]) if len(users) > limit else None
+
+    return {
+        "items": users[:limit],
+        "next_cursor": next_cursor,
+    }
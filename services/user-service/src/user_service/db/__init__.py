@@ -1,8 +1,9 @@
 __all__ = [
     "Base",
     "get_async_session",
+    "get_primary_session",
     "init_db",
 ]
 
 from .base import Base
-from .session import get_async_session, init_db
+from .session import get_async_session, get_primary_session, init_db
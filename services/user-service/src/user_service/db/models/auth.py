@@ -76,6 +76,10 @@ class RefreshToken(Base):
         default=False,
         nullable=False,
     )
+    revoked_at: Mapped[datetime] = mapped_column(
+        nullable=True,
+        index=True,
+    )
 
     user: Mapped["User"] = relationship(
         back_populates="refresh_tokens",
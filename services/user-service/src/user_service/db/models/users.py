@@ -2,7 +2,15 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, CheckConstraint, DateTime, Integer, String, func
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from user_service.db import Base
@@ -13,7 +21,12 @@ if TYPE_CHECKING:
 
 class User(Base):
     __tablename__ = "users"
-    __table_args__ = (CheckConstraint("age BETWEEN 0 AND 100", name="check_age_range"),)
+    __table_args__ = (
+        CheckConstraint("age BETWEEN 0 AND 100", name="check_age_range"),
+        # Keyset pagination order, and the same order within a profession.
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_profession_created_at_id", "profession", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -0,0 +1,132 @@
+import asyncio
+import itertools
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from user_service.core import settings
+
+from .pool import build_engine, pool_stats
+
+# Session.info flag that keeps every statement of the session on the primary.
+PRIMARY = "primary"
+# Session.info key of the replica the session reads from, one per session so
+# that SET LOCAL and the query share a connection.
+REPLICA = "replica"
+
+# Request header that asks for reads from the primary, e.g. right after a write.
+READ_CONSISTENCY_HEADER = "x-read-consistency"
+
+# Seconds the replica is behind, 0 when it has replayed everything it received.
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+def replica_urls(hosts: str = settings.DB_REPLICA_HOSTS) -> dict[str, str]:
+    primary = make_url(settings.DATABASE_URL)
+
+    urls = {}
+    for endpoint in hosts.split(","):
+        endpoint = endpoint.strip()
+        if not endpoint:
+            continue
+        host, _, port = endpoint.partition(":")
+        url = primary.set(host=host, port=int(port) if port else primary.port)
+        urls[endpoint] = url.render_as_string(hide_password=False)
+    return urls
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    healthy: bool = False
+    lag: float | None = None
+
+
+class ReplicaSet:
+    def __init__(self, urls: dict[str, str]):
+        self.replicas = [Replica(name, build_engine(url)) for name, url in urls.items()]
+        self._cycle = itertools.cycle(self.replicas)
+        self._task: asyncio.Task | None = None
+
+    async def check(self, replica: Replica):
+        try:
+            async with asyncio.timeout(settings.DB_REPLICA_HEALTH_TIMEOUT):
+                async with replica.engine.connect() as conn:
+                    replica.lag = float(await conn.scalar(LAG_QUERY))
+        except Exception:
+            replica.healthy = False
+            replica.lag = None
+            return
+
+        replica.healthy = replica.lag <= settings.DB_REPLICA_MAX_LAG
+
+    async def check_all(self):
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(settings.DB_REPLICA_HEALTH_INTERVAL)
+            await self.check_all()
+
+    async def start(self):
+        if not self.replicas:
+            return
+
+        await self.check_all()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def pick(self) -> AsyncEngine | None:
+        """Next healthy replica in round-robin order, None if there is none."""
+
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy:
+                return replica.engine
+        return None
+
+    def stats(self) -> dict:
+        return {
+            replica.name: {
+                "healthy": replica.healthy,
+                "lag": replica.lag,
+                "pool": pool_stats(replica.engine),
+            }
+            for replica in self.replicas
+        }
+
+
+replicas = ReplicaSet(replica_urls())
+
+
+class RoutingSession(Session):
+    """Sends reads that opt in with bind_arguments={"replica": True} to a
+    healthy replica. Everything else uses the primary, and so does every
+    read once the session has written.
+    """
+
+    def get_bind(self, mapper=None, *, clause=None, replica=False, **kw):
+        if self._flushing or (clause is not None and clause.is_dml):
+            self.info[PRIMARY] = True
+
+        if replica and not self.info.get(PRIMARY):
+            engine = self.info.get(REPLICA) or replicas.pick()
+            if engine is not None:
+                self.info[REPLICA] = engine
+                return engine.sync_engine
+
+        return super().get_bind(mapper, clause=clause, **kw)
@@ -0,0 +1,183 @@
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+from sqlalchemy import Table, insert
+from sqlalchemy.exc import (
+    DataError,
+    DBAPIError,
+    IntegrityError,
+    OperationalError,
+    ProgrammingError,
+    SQLAlchemyError,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from user_service.core import settings
+from user_service.exceptions.http_exceptions import DeadlineExceeded, RecordCreate
+
+from ..routing import PRIMARY
+from .deadline import QUERY_CANCELED, within_deadline
+
+INTEGRITY_ERROR = "Integrity error: possible duplicate or invalid foreign key."
+DATA_ERROR = "Invalid data: check types, length, or format."
+CONNECTION_ERROR = "Database connection error or misconfiguration."
+
+
+def chunked(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def python_defaults(table: Table) -> Dict[str, Any]:
+    """Client-side column defaults, which COPY would otherwise skip."""
+
+    defaults = {}
+    for column in table.columns:
+        default = column.default
+        if default is None or not (default.is_scalar or default.is_callable):
+            continue
+        defaults[column.key] = default
+    return defaults
+
+
+def copy_records(
+    chunk: List[Dict], columns: List[str], defaults: Dict[str, Any]
+) -> List[tuple]:
+    records = []
+    for row in chunk:
+        record = []
+        for column in columns:
+            if column in row:
+                record.append(row[column])
+            elif column in defaults:
+                default = defaults[column]
+                record.append(default.arg if default.is_scalar else default.arg(None))
+            else:
+                record.append(None)
+        records.append(tuple(record))
+    return records
+
+
+async def copy_into_table(
+    session: AsyncSession,
+    table: Table,
+    chunk: List[Dict],
+    columns: List[str],
+    defaults: Dict[str, Any],
+) -> int:
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name,
+        records=copy_records(chunk, columns, defaults),
+        columns=columns,
+        schema_name=table.schema,
+    )
+    return len(chunk)
+
+
+def copy_error(exc: Exception) -> Exception:
+    """Map a raw asyncpg error from COPY like SQLAlchemy would."""
+
+    sqlstate = getattr(exc, "sqlstate", None) or ""
+    if sqlstate == QUERY_CANCELED:
+        return DeadlineExceeded()
+    if sqlstate.startswith("23"):
+        return RecordCreate(detail=INTEGRITY_ERROR)
+    if sqlstate.startswith(("22", "42")):
+        return RecordCreate(detail=DATA_ERROR)
+    if sqlstate.startswith("08"):
+        return RecordCreate(detail=CONNECTION_ERROR)
+    return RecordCreate(detail="Unknown error while creating records.")
+
+
+async def bulk_insert_into_table(
+    model_class: object,
+    session: AsyncSession,
+    rows: Iterable[Dict],
+    returning: bool = False,
+    chunk_size: int = settings.DB_BULK_CHUNK_SIZE,
+    copy_threshold: int = settings.DB_BULK_COPY_THRESHOLD,
+    auto_commit: bool = True,
+):
+    """Insert many rows in one transaction.
+
+    With returning=True the inserted models are returned, otherwise the row
+    count. Batches of at least copy_threshold rows go through COPY on
+    PostgreSQL, the rest through multi-row INSERT statements. Rows are
+    expected to share the same keys.
+    """
+
+    table: Table = model_class.__table__
+    rows = iter(rows)
+    head = list(islice(rows, copy_threshold))
+    use_copy = (
+        not returning
+        and len(head) >= max(copy_threshold, 1)
+        and session.get_bind().dialect.driver == "asyncpg"
+    )
+    chunks = chunked(chain(head, rows), chunk_size)
+
+    # Later reads of this session must see the new rows.
+    session.info[PRIMARY] = True
+
+    inserted = [] if returning else 0
+    try:
+        if use_copy:
+            defaults = python_defaults(table)
+            columns = list(dict.fromkeys([*head[0], *defaults]))
+            for chunk in chunks:
+                inserted += await within_deadline(
+                    session,
+                    lambda: copy_into_table(session, table, chunk, columns, defaults),
+                    name="db.copy",
+                )
+        elif returning:
+            statement = insert(model_class).returning(model_class)
+            for chunk in chunks:
+                result = await within_deadline(
+                    session,
+                    lambda: session.scalars(statement, chunk),
+                    name="db.bulk_insert",
+                )
+                inserted.extend(result.all())
+        else:
+            for chunk in chunks:
+                await within_deadline(
+                    session,
+                    lambda: session.execute(insert(model_class), chunk),
+                    name="db.bulk_insert",
+                )
+                inserted += len(chunk)
+
+        if auto_commit:
+            await within_deadline(session, session.commit, name="db.commit")
+
+        return inserted
+
+    except (DeadlineExceeded, RecordCreate):
+        await session.rollback()
+        raise
+
+    except IntegrityError:
+        await session.rollback()
+        raise RecordCreate(detail=INTEGRITY_ERROR)
+
+    except (DataError, ProgrammingError):
+        await session.rollback()
+        raise RecordCreate(detail=DATA_ERROR)
+
+    except (OperationalError, DBAPIError):
+        await session.rollback()
+        raise RecordCreate(detail=CONNECTION_ERROR)
+
+    except SQLAlchemyError:
+        await session.rollback()
+        raise RecordCreate(detail="Unexpected database error occurred.")
+
+    except Exception as exc:
+        await session.rollback()
+        if use_copy:
+            raise copy_error(exc)
+        raise RecordCreate(detail="Unknown error while creating records.")
@@ -0,0 +1,83 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from user_service.db.routing import RoutingSession
+from user_service.exceptions.http_exceptions import DeadlineExceeded
+from user_service.utils import remaining_budget, tracer
+
+T = TypeVar("T")
+
+# PostgreSQL query_canceled, raised when statement_timeout fires.
+QUERY_CANCELED = "57014"
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def set_statement_timeout(session, transaction, connection):
+    """Let the server stop statements that outlive the request's budget.
+
+    Set once per transaction and connection, with what is left of the
+    budget when the transaction begins; the client side timeout of
+    within_deadline holds every statement to what is left at its start.
+    """
+
+    remaining = remaining_budget()
+    if remaining is None or connection.dialect.name != "postgresql":
+        return
+
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {max(int(remaining * 1000), 1)}"
+    )
+
+
+async def discard_transaction(session: AsyncSession):
+    """Roll back after a statement was abandoned midway. A connection that
+    cannot roll back is invalidated so the pool never hands it out again
+    with the transaction still open.
+    """
+
+    try:
+        await session.rollback()
+    except DBAPIError:
+        await session.invalidate()
+
+
+async def within_deadline(
+    session: AsyncSession,
+    operation: Callable[[], Awaitable[T]],
+    name: str = "db.query",
+) -> T:
+    with tracer.span(name, **{"db.system": session.get_bind().dialect.name}):
+        return await _within_deadline(session, operation)
+
+
+async def _within_deadline(
+    session: AsyncSession, operation: Callable[[], Awaitable[T]]
+) -> T:
+    remaining = remaining_budget()
+    if remaining is None:
+        return await operation()
+
+    if remaining <= 0:
+        raise DeadlineExceeded()
+
+    # The client side timeout also covers pool waits and network stalls
+    # that statement_timeout never sees.
+    try:
+        return await asyncio.wait_for(operation(), timeout=remaining)
+    except asyncio.TimeoutError:
+        await discard_transaction(session)
+        raise DeadlineExceeded()
+    except asyncio.CancelledError:
+        await discard_transaction(session)
+        raise
+    except DBAPIError as exc:
+        sqlstate = getattr(exc.orig, "sqlstate", None) or getattr(
+            exc.orig, "pgcode", None
+        )
+        if sqlstate == QUERY_CANCELED:
+            await discard_transaction(session)
+            raise DeadlineExceeded()
+        raise
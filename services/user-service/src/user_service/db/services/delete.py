@@ -3,9 +3,19 @@ from uuid import UUID
 
 from fastapi import HTTPException
 from sqlalchemy import delete
+from sqlalchemy.exc import (
+    DataError,
+    DBAPIError,
+    IntegrityError,
+    OperationalError,
+    ProgrammingError,
+    SQLAlchemyError,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
-from user_service.exceptions.http_exceptions import RecordDelete
+from user_service.exceptions.http_exceptions import DeadlineExceeded, RecordDelete
+
+from .deadline import within_deadline
 
 
 async def delete_record(
@@ -18,15 +28,21 @@ async def delete_record(
             model_class.id == id,
         )
 
-        result = await session.execute(stmt)
+        result = await within_deadline(
+            session, lambda: session.execute(stmt), name="db.delete"
+        )
 
         if result.rowcount == 0:
             raise Exception(f"no record deleted: {id}")
 
-        await session.commit()
+        await within_deadline(session, session.commit, name="db.commit")
 
         return True
 
+    except DeadlineExceeded:
+        await session.rollback()
+        raise
+
     except IntegrityError:
         await session.rollback()
         raise RecordDelete(
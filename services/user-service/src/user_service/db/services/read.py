@@ -2,10 +2,23 @@ from typing import List, Type
 
 from fastapi import HTTPException
 from pydantic import BaseModel
+from sqlalchemy.exc import (
+    DataError,
+    DBAPIError,
+    IntegrityError,
+    OperationalError,
+    ProgrammingError,
+    SQLAlchemyError,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Query
 from starlette import status
-from user_service.exceptions.http_exceptions import RecordRead
+from user_service.exceptions.http_exceptions import DeadlineExceeded, RecordRead
+
+from .deadline import within_deadline
+
+# Lets the routing session serve the read from a replica.
+REPLICA_READ = {"replica": True}
 
 
 async def get_data_from_table(
@@ -16,14 +29,25 @@ async def get_data_from_table(
 
     try:
         if __get_all__:
-            __models__: List[BaseModel] | [] = await session.scalars(query)
+            __models__: List[BaseModel] | [] = await within_deadline(
+                session,
+                lambda: session.scalars(query, bind_arguments=REPLICA_READ),
+                name="db.select",
+            )
 
             return __models__.all()
         else:
-            __model__: BaseModel | None = await session.scalar(query)
+            __model__: BaseModel | None = await within_deadline(
+                session,
+                lambda: session.scalar(query, bind_arguments=REPLICA_READ),
+                name="db.select",
+            )
 
             return __model__
 
+    except DeadlineExceeded:
+        raise
+
     except (DataError, ProgrammingError):
         raise RecordRead(
             detail="Query error: possibly wrong column, bad filter, or invalid data type."
@@ -2,9 +2,19 @@ import uuid
 
 from fastapi import HTTPException
 from sqlalchemy import update
+from sqlalchemy.exc import (
+    DataError,
+    DBAPIError,
+    IntegrityError,
+    OperationalError,
+    ProgrammingError,
+    SQLAlchemyError,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
-from user_service.exceptions.http_exceptions import RecordUpdate
+from user_service.exceptions.http_exceptions import DeadlineExceeded, RecordUpdate
+
+from .deadline import within_deadline
 
 
 async def update_model(
@@ -14,32 +24,40 @@ async def update_model(
     schema: dict,
 ) -> bool:
     try:
-        await session.execute(
-            update(model_class).where(model_class.id == id).values(**schema)
+        await within_deadline(
+            session,
+            lambda: session.execute(
+                update(model_class).where(model_class.id == id).values(**schema)
+            ),
+            name="db.update",
         )
 
-        await session.commit()
+        await within_deadline(session, session.commit, name="db.commit")
 
         return True
 
+    except DeadlineExceeded:
+        await session.rollback()
+        raise
+
     except IntegrityError:
         await session.rollback()
-        raise RecordCreate(
+        raise RecordUpdate(
             detail="Integrity error: possible duplicate or invalid foreign key."
         )
 
     except (DataError, ProgrammingError):
         await session.rollback()
-        raise RecordCreate(detail="Invalid data: check types, length, or format.")
+        raise RecordUpdate(detail="Invalid data: check types, length, or format.")
 
     except (OperationalError, DBAPIError):
         await session.rollback()
-        raise RecordCreate(detail="Database connection error or misconfiguration.")
+        raise RecordUpdate(detail="Database connection error or misconfiguration.")
 
     except SQLAlchemyError:
         await session.rollback()
-        raise RecordCreate(detail="Unexpected database error occurred.")
+        raise RecordUpdate(detail="Unexpected database error occurred.")
 
     except Exception:
         await session.rollback()
-        raise RecordCreate(detail="Unknown error while creating record.")
+        raise RecordUpdate(detail="Unknown error while creating record.")
@@ -9,7 +9,9 @@ from sqlalchemy.exc import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
-from user_service.exceptions.http_exceptions import RecordCreate
+from user_service.exceptions.http_exceptions import DeadlineExceeded, RecordCreate
+
+from .deadline import within_deadline
 
 
 async def insert_into_table(
@@ -30,12 +32,16 @@ async def insert_into_table(
             session.add(__model__)
 
             if auto_flush:
-                await session.flush()
+                await within_deadline(session, session.flush, name="db.flush")
             elif auto_commit:
-                await session.commit()
+                await within_deadline(session, session.commit, name="db.commit")
 
             return __model__
 
+    except DeadlineExceeded:
+        await session.rollback()
+        raise
+
     except IntegrityError:
         await session.rollback()
         raise RecordCreate(
@@ -1,24 +1,32 @@
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from user_service.core import settings
 from user_service.db import Base
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    future=True,
-)
+from .pool import build_engine
+from .routing import PRIMARY, READ_CONSISTENCY_HEADER, RoutingSession
+
+engine = build_engine(settings.DATABASE_URL)
 
 AsyncSessionMaker = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_async_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionMaker() as session:
+        if request.headers.get(READ_CONSISTENCY_HEADER) == "primary":
+            session.info[PRIMARY] = True
+        yield session
+
+
+async def get_primary_session() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionMaker(info={PRIMARY: True}) as session:
         yield session
 
 
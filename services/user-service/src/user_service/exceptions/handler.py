@@ -1,11 +1,11 @@
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from user_service.core import FastJSONResponse
 
 from .base import AppException
 
 
 async def app_exception_handler(request: Request, exc: AppException):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "sender": exc.sender,
@@ -44,3 +44,18 @@ class CTRLException(AppException):
 class HTTPXException(AppException):
     def __init__(self, sender: str, detail: str):
         super().__init__(status_code=400, sender=sender, detail=detail)
+
+
+class DeadlineExceeded(AppException):
+    def __init__(self, detail: str = "Request deadline exceeded"):
+        super().__init__(status_code=504, sender="deadline", detail=detail)
+
+
+class AdminAuthException(AppException):
+    def __init__(self, detail: str = "Admin API key required"):
+        super().__init__(status_code=403, sender="admin_dependency", detail=detail)
+
+
+class UnsupportedMediaType(AppException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=415, sender="validation service", detail=detail)
@@ -1,9 +1,13 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from user_service.api.metrics import router as metrics_router
 from user_service.api.v1 import router as api_v1_router
+from user_service.core import FastJSONResponse
 from user_service.db import init_db
+from user_service.db.routing import replicas
 from user_service.exceptions import AppException, app_exception_handler
+from user_service.utils import DeadlineMiddleware, TracingMiddleware, tracer
 
 
 @asynccontextmanager
@@ -12,15 +16,23 @@ async def lifespan(app: FastAPI):
         await init_db()
     except Exception as e:
         print(f"[Startup Error] DB init failed: {e}")
-    yield
+    await replicas.start()
+    try:
+        yield
+    finally:
+        await replicas.stop()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(lifespan=lifespan)
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
     app.add_exception_handler(AppException, app_exception_handler)
 
+    app.add_middleware(DeadlineMiddleware)
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+
     app.include_router(api_v1_router)
+    app.include_router(metrics_router)
 
     return app
 
@@ -5,6 +5,7 @@ from fastapi import HTTPException
 from httpx import AsyncClient
 from starlette import status
 from user_service.exceptions.http_exceptions import HTTPXException
+from user_service.utils import tracer
 
 
 async def async_request(
@@ -14,12 +15,16 @@ async def async_request(
         try:
             body = json.dumps(body)
 
-            await client.request(
-                method=method.upper(),
-                url=endpoint,
-                headers=headers,
-                content=body,
-            )
+            with tracer.span(
+                "http.request", method=method.upper(), url=f"{base_url}{endpoint}"
+            ) as span:
+                response = await client.request(
+                    method=method.upper(),
+                    url=endpoint,
+                    headers=tracer.inject(dict(headers or {})),
+                    content=body,
+                )
+                span.set_attribute("http.status_code", response.status_code)
         except httpx.RequestError:
             raise HTTPXException(
                 sender="Notific Oceaen", detail=f"Request error at: {endpoint}"
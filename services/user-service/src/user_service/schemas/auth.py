@@ -1,5 +1,7 @@
+import uuid
+from datetime import datetime
 from operator import xor
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field, model_validator
 from user_service.utils import password_validator
@@ -60,3 +62,12 @@ class PasswordResetOTP(LoginRequest):
     otp: str = Field(
         description="OTP",
     )
+
+
+class RevokedTokensResponse(BaseModel):
+    revoked: List[uuid.UUID] = Field(
+        description="Ids of refresh tokens revoked in the requested window",
+    )
+    until: datetime = Field(
+        description="Upper bound of the window, pass it back as 'since'",
+    )
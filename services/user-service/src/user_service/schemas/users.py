@@ -64,6 +64,22 @@ class UserResponse(UserShortResponse):
         from_attributes = True
 
 
+class UserShortPage(BaseModel):
+    items: list[UserShortResponse]
+    next_cursor: str | None = Field(
+        None,
+        description="Pass as cursor to fetch the next page. Null on the last page.",
+    )
+
+
+class UserPage(BaseModel):
+    items: list[UserResponse]
+    next_cursor: str | None = Field(
+        None,
+        description="Pass as cursor to fetch the next page. Null on the last page.",
+    )
+
+
 class UserUpdate(BaseModel):
     age: Optional[int] = Field(None, ge=0, le=100)
     profession: Optional[str] = Field(None, max_length=100)
@@ -1,13 +1,20 @@
 __all__ = [
     "hash_password",
+    "hash_passwords",
     "verify_password",
     "password_validator",
     "create_token",
     "decode_token",
     "hash_token",
+    "DeadlineMiddleware",
+    "remaining_budget",
+    "TracingMiddleware",
+    "tracer",
 ]
 
 
-from .hasher import hash_password, hash_token, verify_password
+from .deadline import DeadlineMiddleware, remaining_budget
+from .hasher import hash_password, hash_passwords, hash_token, verify_password
 from .jwt_tokens import create_token, decode_token
+from .tracing import TracingMiddleware, tracer
 from .validators import password_validator
@@ -0,0 +1,48 @@
+import time
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from user_service.core import FastJSONResponse
+
+# Remaining time budget in milliseconds, set by the gateway.
+DEADLINE_HEADER = "x-request-timeout-ms"
+
+request_deadline: ContextVar[float | None] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def remaining_budget() -> float | None:
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        budget = None
+        if scope["type"] == "http":
+            budget = Headers(scope=scope).get(DEADLINE_HEADER)
+
+        if budget is None or not budget.isdigit():
+            await self.app(scope, receive, send)
+            return
+
+        if int(budget) <= 0:
+            response = FastJSONResponse(
+                status_code=504,
+                content={"sender": "deadline", "detail": "Request deadline exceeded"},
+            )
+            await response(scope, receive, send)
+            return
+
+        token = request_deadline.set(time.monotonic() + int(budget) / 1000)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
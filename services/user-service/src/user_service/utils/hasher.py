@@ -1,26 +1,53 @@
 import asyncio
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 import bcrypt
 from user_service.core import settings
 
+from .tracing import tracer
+
+# bcrypt releases the GIL, so a thread pool hashes on every core.
+hash_pool = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+
+
+def _hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+
 
 async def hash_password(password: str) -> str:
-    hashed = await asyncio.to_thread(
-        bcrypt.hashpw,
-        password.encode(),
-        bcrypt.gensalt(),
-    )
+    with tracer.span("bcrypt.hash"):
+        hashed = await asyncio.to_thread(
+            bcrypt.hashpw,
+            password.encode(),
+            bcrypt.gensalt(),
+        )
 
     return hashed.decode()
 
 
+async def hash_passwords(passwords: list[str]) -> list[str]:
+    loop = asyncio.get_running_loop()
+    with tracer.span("bcrypt.hash_many", count=len(passwords)):
+        hashed = await asyncio.gather(
+            *(
+                loop.run_in_executor(hash_pool, _hash, password)
+                for password in passwords
+            )
+        )
+
+    return list(hashed)
+
+
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    is_valid = await asyncio.to_thread(
-        bcrypt.checkpw,
-        plain_password.encode(),
-        hashed_password.encode(),
-    )
+    with tracer.span("bcrypt.verify"):
+        is_valid = await asyncio.to_thread(
+            bcrypt.checkpw,
+            plain_password.encode(),
+            hashed_password.encode(),
+        )
 
     return is_valid
 